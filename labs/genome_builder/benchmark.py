@@ -0,0 +1,152 @@
+"""Benchmark of the genome_builder hot paths.
+
+Sweeps genome length and lab9 problem size, prints a table and writes machine readable results:
+
+    python benchmark.py --output results.json
+    python benchmark.py --baseline results.json    # compare against stored results
+"""
+
+from __future__ import annotations
+from typing import Callable
+from dataclasses import dataclass, asdict
+from argparse import ArgumentParser
+from itertools import product
+from functools import cache, partial
+from random import seed
+from time import perf_counter
+from tracemalloc import start, stop, get_traced_memory, reset_peak
+from json import dump, load
+from lab9_lib import make_problem
+from src.array_population import ArrayPopulation
+from src.fitness_cache import shared_cache
+from src.genome import Genome
+from src.population import Population, tournament_selection
+
+LENGTHS = (100, 1_000, 10_000, 100_000)
+SIZES = (1, 2, 5, 10)
+
+@dataclass(frozen=True)
+class Result:
+    benchmark: str
+    length: int
+    size: int
+    ops_per_second: float
+    fitness_calls_per_op: float
+
+    @property
+    def key(self) -> str:
+        return f'{self.benchmark}/{self.length}/{self.size}'
+
+def measure(operation: Callable[[], object], problem, min_time: float) -> tuple[float, float]:
+    """Operations per second and fitness calls per operation, repeating the operation for at least min_time"""
+
+    calls, operations, start_time = problem.calls, 0, perf_counter()
+    while not operations or perf_counter() - start_time < min_time:
+        operation()
+        operations += 1
+    elapsed = perf_counter() - start_time
+    return operations / elapsed, (problem.calls - calls) / operations
+
+def memory_per_genome(length: int, problem, count = 100) -> float:
+    """Peak bytes allocated per scored genome"""
+
+    start()
+    reset_peak()
+    genomes = [Genome.random(length, problem) for _ in range(count)]
+    for genome in genomes:
+        genome.fitness
+    peak = get_traced_memory()[1]
+    stop()
+    return peak / count
+
+def benchmarks(length: int, size: int) -> tuple[object, dict[str, Callable[[], Callable[[], object]]]]:
+    """The problem whose calls are counted and the operations to time, each built by its setup only when run"""
+
+    problem = make_problem(size)
+    first, second = Genome.random(length, problem), Genome.random(length, problem)
+
+    @cache
+    def population() -> Population:
+        # hill climbing the initial population of the longest genomes would dominate the whole run
+        return Population.initial(length, problem) if length <= 10_000 else Population.random(length, problem)
+
+    def next_generation() -> Callable[[], object]:
+        generation = [population()]
+        def operation():
+            generation[0] = generation[0].next_generation()
+        return operation
+
+    def array_next_generation() -> Callable[[], object]:
+        generation = [ArrayPopulation.from_population(population())]
+        def operation():
+            generation[0] = generation[0].next_generation()
+        return operation
+
+    return problem, {
+        'combine': lambda: lambda: first.combine(second),
+        'mutate': lambda: first.mutate,
+        'climb_hill': lambda: lambda: Genome.random(length, problem).climb_hill(),
+        'distance': lambda: lambda: first.distance(second),
+        'tournament_selection': lambda: partial(tournament_selection, population().genomes, 100),
+        'next_generation': next_generation,
+        'array_next_generation': array_next_generation,
+    }
+
+def run(lengths: tuple[int, ...], sizes: tuple[int, ...], min_time: float, only: list[str] | None = None) -> dict:
+    seed(0)
+    results: list[Result] = []
+    memory: dict[str, float] = dict()
+    for length, size in product(lengths, sizes):
+        shared_cache.clear()
+        problem, setups = benchmarks(length, size)
+        for name, setup in setups.items():
+            if only and name not in only:
+                continue
+            ops_per_second, calls = measure(setup(), problem, min_time)
+            results.append(Result(name, length, size, ops_per_second, calls))
+            print(f'{name:<22}{length:>8}{size:>4}{ops_per_second:>14.2f} op/s{calls:>10.1f} calls/op')
+        memory[f'{length}/{size}'] = memory_per_genome(length, make_problem(size))
+        print(f'{"memory":<22}{length:>8}{size:>4}{memory[f"{length}/{size}"]:>14.0f} bytes/genome')
+    return {
+        'results': [asdict(result) for result in results],
+        'bytes_per_genome': memory,
+        'generations_per_second': {r.key: r.ops_per_second for r in results if r.benchmark.endswith('next_generation')},
+        'fitness_calls_per_generation': {r.key: r.fitness_calls_per_op for r in results if r.benchmark.endswith('next_generation')},
+    }
+
+def compare(current: dict, baseline: dict, tolerance: float) -> bool:
+    """Prints the speedup of every benchmark against the baseline, False if any is slower than tolerance allows"""
+
+    stored = {Result(**result).key: Result(**result) for result in baseline['results']}
+    regression = False
+    for result in (Result(**result) for result in current['results']):
+        if result.key not in stored:
+            continue
+        speedup = result.ops_per_second / stored[result.key].ops_per_second
+        slower = speedup < 1 - tolerance
+        regression |= slower
+        print(f'{result.key:<36}{speedup:>8.2f}x{"  REGRESSION" if slower else ""}')
+    return not regression
+
+def main():
+    parser = ArgumentParser(description = __doc__)
+    parser.add_argument('--lengths', type = int, nargs = '+', default = LENGTHS)
+    parser.add_argument('--sizes', type = int, nargs = '+', default = SIZES)
+    parser.add_argument('--only', nargs = '+', help = 'benchmarks to run, all by default')
+    parser.add_argument('--min-time', type = float, default = .2, help = 'seconds spent on each measure')
+    parser.add_argument('--output', help = 'json file the results are written to')
+    parser.add_argument('--baseline', help = 'json file with results to compare against')
+    parser.add_argument('--tolerance', type = float, default = .1, help = 'accepted slow down against the baseline')
+    arguments = parser.parse_args()
+
+    results = run(tuple(arguments.lengths), tuple(arguments.sizes), arguments.min_time, arguments.only)
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            dump(results, file, indent = 2)
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            if not compare(results, load(file), arguments.tolerance):
+                raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
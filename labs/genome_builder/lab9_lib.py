@@ -3,6 +3,7 @@
 # Free for personal or classroom use; see 'LICENSE.md' for details.
 
 from abc import abstractmethod
+from numpy import array, asarray, bincount, count_nonzero, sort, stack, zeros
 
 
 class AbstractProblem:
@@ -18,17 +19,51 @@ class AbstractProblem:
     def calls(self):
         return self._calls
 
+    def add_calls(self, calls):
+        """Accounts for calls made on a copy of the problem, e.g. in a worker process"""
+        self._calls += calls
+
     @staticmethod
     def onemax(genome):
         return sum(bool(g) for g in genome)
 
-    def __call__(self, genome):
-        self._calls += 1
-        fitnesses = sorted((AbstractProblem.onemax(genome[s :: self.x]) for s in range(self.x)), reverse=True)
+    def onemaxes(self, genome):
+        """Onemax of every stride of the genome, the state from which the fitness is computed"""
+        return [int(count_nonzero(genome[s :: self.x])) for s in range(self.x)]
+
+    @staticmethod
+    def score(onemaxes, length):
+        fitnesses = sorted(onemaxes, reverse=True)
         val = sum(f for f in fitnesses if f == fitnesses[0]) - sum(
             f * (0.1 ** (k + 1)) for k, f in enumerate(f for f in fitnesses if f < fitnesses[0])
         )
-        return val / len(genome)
+        return val / length
+
+    def __call__(self, genome):
+        self._calls += 1
+        return AbstractProblem.score(self.onemaxes(genome), len(genome))
+
+    def delta(self, genome, onemaxes, flipped):
+        """Fitness of genome with the loci in flipped toggled, updating the onemaxes of genome in O(len(flipped)).
+        Counts as a call and returns the same value as a full evaluation, together with the child onemaxes"""
+        self._calls += 1
+        flipped = asarray(flipped, dtype=int)
+        changes = bincount(flipped % self.x, weights=1 - 2 * (asarray(genome)[flipped] != 0), minlength=self.x)
+        child_onemaxes = [f + int(c) for f, c in zip(onemaxes, changes)]
+        return AbstractProblem.score(child_onemaxes, len(genome)), child_onemaxes
+
+    def batch(self, genomes):
+        """Fitness of every row of a 2-D array of genomes, same values as calling the problem on each row"""
+        self._calls += len(genomes)
+        fitnesses = -sort(-stack([count_nonzero(genomes[:, s :: self.x], axis=1) for s in range(self.x)], axis=1), axis=1)
+        top_count = (fitnesses == fitnesses[:, :1]).sum(axis=1)
+        weights = array([0.1 ** (k + 1) for k in range(self.x)])
+        penalty = zeros(len(genomes))
+        for p in range(self.x):  # accumulated column by column, in the same order as __call__, to get identical floats
+            lower = p >= top_count
+            penalty[lower] += fitnesses[lower, p] * weights[p - top_count[lower]]
+        val = fitnesses[:, 0] * top_count - penalty
+        return val / genomes.shape[1]
 
 
 def make_problem(a):
@@ -38,4 +73,8 @@ def make_problem(a):
         def x(self):
             return a
 
+        def __reduce__(self):
+            # the class is local to make_problem, pickled copies are rebuilt by the factory (with no calls)
+            return make_problem, (a,)
+
     return Problem()
@@ -0,0 +1,159 @@
+from __future__ import annotations
+from typing import Callable, Literal
+from dataclasses import dataclass, field
+from functools import cached_property
+from numpy import uint8, float64, bool_, arange, argmax, argsort, concatenate, packbits, unpackbits, unique, where, zeros
+from numpy.random import Generator, default_rng
+from numpy.typing import NDArray
+from src.evaluation import evaluate
+from src.genome import Genome
+from src.selection import tournament
+from src.population import Population
+
+Genes = NDArray[uint8]
+
+def mutation_rates(fitnesses: NDArray[float64], genome_length: int) -> NDArray[float64]:
+    """Per row flip probability, same expected flips as Genome.mutate (proportional to the distance from fitness 1)"""
+
+    mutations_count = (genome_length * (1 - fitnesses)).round().clip(min = 1)
+    return mutations_count / genome_length
+
+def mutate(genes: Genes, rates: NDArray[float64], rng: Generator) -> Genes:
+    """Flips every locus of row i with probability rates[i], at least one locus per row is flipped"""
+
+    flips: NDArray[bool_] = rng.random(genes.shape) < rates[:, None]
+    unchanged = ~flips.any(axis = 1)
+    flips[unchanged, rng.integers(0, genes.shape[1], size = unchanged.sum())] = True
+    return genes ^ flips
+
+def combine(first: Genes, second: Genes, rng: Generator, strategy: Literal['mix', 'one cut'] = 'mix') -> Genes:
+    """Row-wise crossover of two parent matrices of equal shape"""
+
+    if strategy == 'mix':
+        return where(rng.random(first.shape) < .5, first, second)
+    if strategy == 'one cut':
+        cut_index = rng.integers(1, first.shape[1], size = len(first))
+        return where(arange(first.shape[1]) < cut_index[:, None], first, second)
+    raise ValueError(f'Strategy {strategy} not valid')
+
+def climb_hill(genes: Genes, fitnesses: NDArray[float64], fitness_fn: Callable[[list[int]], float], rng: Generator,
+               max_steps = 100, max_non_improving_steps = 5, λ = 3) -> tuple[Genes, NDArray[float64]]:
+    """Genome.climb_hill applied to every row at once, rows stop climbing independently"""
+
+    genes, fitnesses = genes.copy(), fitnesses.copy()
+    non_improving_steps = zeros(len(genes), dtype = int)
+    climbing = arange(len(genes))
+    for _ in range(max_steps):
+        if not len(climbing):
+            break
+        parents = genes[climbing].repeat(λ, axis = 0)
+        rates = mutation_rates(fitnesses[climbing], genes.shape[1]).repeat(λ)
+        children = mutate(parents, rates, rng)
+        children_fitnesses = evaluate(children, fitness_fn).reshape(len(climbing), λ)
+        best_child = argmax(children_fitnesses, axis = 1)
+        best_fitness = children_fitnesses[arange(len(climbing)), best_child]
+        improved = best_fitness > fitnesses[climbing]
+        winners = climbing[improved]
+        genes[winners] = children.reshape(len(climbing), λ, -1)[improved, best_child[improved]]
+        fitnesses[winners] = best_fitness[improved]
+        non_improving_steps[winners] = 0
+        non_improving_steps[climbing[~improved]] += 1
+        climbing = climbing[non_improving_steps[climbing] < max_non_improving_steps]
+    return genes, fitnesses
+
+@dataclass
+class ArrayPopulation:
+    """Population stored as one contiguous (population x loci) matrix of 0/1 uint8 genes"""
+
+    genes: Genes
+    fitness_fn: Callable[[list[int]], float]
+    rng: Generator = field(default_factory = default_rng, repr = False)
+
+    def __len__(self) -> int:
+        return len(self.genes)
+
+    def __getitem__(self, index: int) -> Genome:
+        return Genome.from_array(self.genes[index], self.fitness_fn)
+
+    @property
+    def genome_length(self) -> int:
+        return self.genes.shape[1]
+
+    @cached_property
+    def fitnesses(self) -> NDArray[float64]:
+        return evaluate(self.genes, self.fitness_fn)
+
+    @property
+    def genomes(self) -> list[Genome]:
+        return [self[i] for i in range(len(self))]
+
+    @property
+    def average_fitness(self) -> float:
+        return float(self.fitnesses.mean())
+
+    @property
+    def best_genome(self) -> Genome:
+        return self[int(argmax(self.fitnesses))]
+
+    def packed(self) -> NDArray[uint8]:
+        """Bit-packed genes, 8 loci per byte"""
+        return packbits(self.genes, axis = 1)
+
+    def tournament_selection(self, selected_count: int, tournament_size = 2) -> NDArray:
+        """Row indices of the winners of {selected_count} independent tournaments"""
+
+        return tournament(self.fitnesses, selected_count, tournament_size, self.rng)
+
+    def recombination(self, children_count: int) -> Genes:
+        """Tournament selection of size 2 determines parents, which are coupled and combined"""
+
+        parents = self.tournament_selection(children_count * 2).reshape(children_count, 2)
+        parents = parents[parents[:, 0] != parents[:, 1]] # recombining element with itself makes no sense
+        return combine(self.genes[parents[:, 0]], self.genes[parents[:, 1]], self.rng)
+
+    def next_generation(self, children_count = 20, random_count = 4) -> ArrayPopulation:
+        children = self.recombination(children_count)
+        children, children_fitnesses = climb_hill(children, evaluate(children, self.fitness_fn), self.fitness_fn, self.rng)
+        randoms = self.rng.integers(0, 2, size = (random_count, self.genome_length), dtype = uint8)
+        randoms, randoms_fitnesses = climb_hill(randoms, evaluate(randoms, self.fitness_fn), self.fitness_fn, self.rng)
+        pool = concatenate([self.genes, children, randoms])
+        pool_fitnesses = concatenate([self.fitnesses, children_fitnesses, randoms_fitnesses])
+        _, unique_indices = unique(packbits(pool, axis = 1), axis = 0, return_index = True)
+        ranked = unique_indices[argsort(-pool_fitnesses[unique_indices], kind = 'stable')][:len(self)]
+        return self.with_genes(pool[ranked], pool_fitnesses[ranked])
+
+    def with_genes(self, genes: Genes, fitnesses: NDArray[float64] | None = None) -> ArrayPopulation:
+        """A population sharing fitness function and random generator, fitnesses are reused if known"""
+
+        population = ArrayPopulation(genes, self.fitness_fn, self.rng)
+        if fitnesses is not None:
+            population.__dict__['fitnesses'] = fitnesses
+        return population
+
+    def to_population(self) -> Population:
+        return Population(self.genomes)
+
+    @staticmethod
+    def from_population(population: Population, rng: Generator | None = None) -> ArrayPopulation:
+        genes = concatenate([genome.array[None, :] for genome in population.genomes])
+        return ArrayPopulation(genes, population.genomes[0].fitness_fn, rng or default_rng())
+
+    @staticmethod
+    def from_packed(packed: NDArray[uint8], genome_length: int, fitness_fn: Callable[[list[int]], float],
+                    rng: Generator | None = None) -> ArrayPopulation:
+        genes = unpackbits(packed, axis = 1, count = genome_length)
+        return ArrayPopulation(genes, fitness_fn, rng or default_rng())
+
+    @staticmethod
+    def random(genome_size: int, fitness_fn: Callable[[list[int]], float], population_size = 30,
+               rng: Generator | None = None) -> ArrayPopulation:
+        rng = rng or default_rng()
+        return ArrayPopulation(rng.integers(0, 2, size = (population_size, genome_size), dtype = uint8), fitness_fn, rng)
+
+    @staticmethod
+    def initial(genome_size: int, fitness_fn: Callable[[list[int]], float], population_size = 30,
+                rng: Generator | None = None) -> ArrayPopulation:
+        """Random genomes locally optimized by the hill climber, see Population.initial"""
+
+        randoms = ArrayPopulation.random(genome_size, fitness_fn, population_size, rng)
+        return randoms.with_genes(*climb_hill(randoms.genes, randoms.fitnesses, fitness_fn, randoms.rng))
@@ -0,0 +1,140 @@
+from __future__ import annotations
+from typing import Callable, Iterator, TYPE_CHECKING
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from os import replace
+from shutil import rmtree
+from tempfile import mkdtemp
+from json import dump, load as load_json
+from random import getstate, setstate
+from numpy import uint8, float64, load as load_array, save as save_array
+from numpy.typing import NDArray
+from src.islands import IslandStats, pack, unpack
+from src.population import Population
+
+if TYPE_CHECKING:
+    from src.islands import Archipelago
+
+FORMAT_VERSION = 1
+
+@dataclass
+class Checkpoint:
+    """A population restored from disk, genes are memory-mapped and unpacked once"""
+
+    population: Population
+    generation: int
+    calls: int
+    packed: NDArray[uint8] # read-only memory map of the bit-packed genes, one row per genome
+    fitnesses: NDArray[float64]
+
+@contextmanager
+def _directory(path: Path) -> Iterator[Path]:
+    """A fresh directory next to path to write a checkpoint into, renamed to path once complete. The previous
+    checkpoint is moved aside first and removed last, so path never holds files of two different saves"""
+
+    path.parent.mkdir(parents = True, exist_ok = True)
+    temporary = Path(mkdtemp(dir = path.parent, prefix = f'.{path.name}.'))
+    try:
+        yield temporary
+    except BaseException:
+        rmtree(temporary, ignore_errors = True)
+        raise
+    previous = temporary.with_name(f'{temporary.name}.previous')
+    if path.exists():
+        replace(path, previous)
+    replace(temporary, path)
+    rmtree(previous, ignore_errors = True)
+
+def _write_json(path: Path, content: dict) -> None:
+    with open(path, 'w') as file:
+        dump(content, file)
+
+def random_state_to_json(state: tuple) -> list:
+    version, internal_state, gauss_next = state
+    return [version, list(internal_state), gauss_next]
+
+def random_state_from_json(state: list) -> tuple:
+    version, internal_state, gauss_next = state
+    return version, tuple(internal_state), gauss_next
+
+def _save(path: Path, population: Population, generation: int, random_state: tuple | None) -> None:
+    path.mkdir(exist_ok = True)
+    packed, fitnesses = pack(population.genomes)
+    fitness_fn = population.genomes[0].fitness_fn
+    save_array(path / 'genes.npy', packed)
+    save_array(path / 'fitness.npy', fitnesses)
+    _write_json(path / 'meta.json', {
+        'version': FORMAT_VERSION,
+        'genome_length': len(population.genomes[0].array),
+        'generation': generation,
+        'calls': getattr(fitness_fn, 'calls', 0),
+        'random_state': random_state_to_json(random_state or getstate()),
+    })
+
+def save(path: str | Path, population: Population, generation = 0, random_state: tuple | None = None) -> None:
+    """Writes genes bit-packed (genes.npy), fitnesses (fitness.npy) and a small meta.json to directory path,
+    replacing its content. Files are written to a temporary directory renamed to path when complete, so that an
+    interrupted save never leaves a checkpoint with mismatching files.
+    The state of the random module is saved too, unless another one is given"""
+
+    with _directory(Path(path)) as directory:
+        _save(directory, population, generation, random_state)
+
+def load(path: str | Path, fitness_fn: Callable[[list[int]], float], restore_random = True) -> Checkpoint:
+    """Restores a population with its fitnesses, nothing is re-evaluated. The calls counter of fitness_fn is
+    brought up to the saved value and the random module state is restored, so the run continues as if never stopped"""
+
+    path = Path(path)
+    with open(path / 'meta.json') as file:
+        meta = load_json(file)
+    if meta['version'] != FORMAT_VERSION:
+        raise ValueError(f'Checkpoint format {meta["version"]} not supported')
+    packed = load_array(path / 'genes.npy', mmap_mode = 'r')
+    fitnesses = load_array(path / 'fitness.npy', mmap_mode = 'r')
+    population = Population(unpack((packed, fitnesses), meta['genome_length'], fitness_fn))
+    missing_calls = meta['calls'] - getattr(fitness_fn, 'calls', 0)
+    if missing_calls > 0 and hasattr(fitness_fn, 'add_calls'):
+        fitness_fn.add_calls(missing_calls)
+    if restore_random:
+        setstate(random_state_from_json(meta['random_state']))
+    return Checkpoint(population, meta['generation'], meta['calls'], packed, fitnesses)
+
+def save_archipelago(path: str | Path, archipelago: Archipelago) -> None:
+    """One checkpoint per island (island_0, island_1, ...) holding the island random state, plus the driver state,
+    replaced all together as save does for a single checkpoint"""
+
+    with _directory(Path(path)) as directory:
+        for island, (population, random_state) in enumerate(archipelago.states()):
+            _save(directory / f'island_{island}', population, archipelago.generation, random_state)
+        _write_json(directory / 'meta.json', {
+            'version': FORMAT_VERSION,
+            'islands': archipelago.islands,
+            'generation': archipelago.generation,
+            'calls': getattr(archipelago.fitness_fn, 'calls', 0),
+            'migration_state': archipelago.migration_state,
+            'history': [[[s.generation, s.best_fitness, s.average_fitness] for s in epoch] for epoch in archipelago.history],
+        })
+
+def load_archipelago(path: str | Path, archipelago: Archipelago) -> None:
+    """Restores populations, random states (of the islands and of the random topology) and generation counter
+    into a freshly created archipelago with the same number of islands"""
+
+    path = Path(path)
+    with open(path / 'meta.json') as file:
+        meta = load_json(file)
+    if meta['islands'] != archipelago.islands:
+        raise ValueError(f'Checkpoint has {meta["islands"]} islands, archipelago {archipelago.islands}')
+    states = []
+    for island in range(archipelago.islands):
+        checkpoint = load(path / f'island_{island}', archipelago.fitness_fn, restore_random = False)
+        with open(path / f'island_{island}' / 'meta.json') as file:
+            random_state = random_state_from_json(load_json(file)['random_state'])
+        states.append((checkpoint.population, random_state))
+    archipelago.restore(states)
+    archipelago.migration_state = meta['migration_state']
+    archipelago.generation = meta['generation']
+    archipelago.history = [[IslandStats(island, *stats) for island, stats in enumerate(epoch)] for epoch in meta['history']]
+    missing_calls = meta['calls'] - getattr(archipelago.fitness_fn, 'calls', 0)
+    if missing_calls > 0 and hasattr(archipelago.fitness_fn, 'add_calls'):
+        archipelago.fitness_fn.add_calls(missing_calls)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from numpy import uint8, uint64, int64, float32, argpartition, argsort, array, concatenate, empty, packbits, pad, take_along_axis, triu_indices
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from src.genome import Genome
+
+Words = NDArray[uint64]
+
+try:
+    from numpy import bitwise_count # numpy >= 2.0
+    def popcount(words: Words) -> NDArray[int64]:
+        """Set bits of every row of words"""
+        return bitwise_count(words).sum(axis = -1, dtype = int64)
+except ImportError:
+    BYTE_POPCOUNT = array([bin(byte).count('1') for byte in range(256)], dtype = uint8)
+    def popcount(words: Words) -> NDArray[int64]:
+        """Set bits of every row of words"""
+        return BYTE_POPCOUNT[words.view(uint8)].sum(axis = -1, dtype = int64)
+
+def pack(genes: NDArray[uint8]) -> Words:
+    """0/1 genes (one genome or one per row) to bit-packed 64-bit words, padded with zeros"""
+
+    packed = packbits(genes, axis = -1)
+    padding = -packed.shape[-1] % 8
+    if padding:
+        packed = pad(packed, [(0, 0)] * (packed.ndim - 1) + [(0, padding)])
+    return packed.view(uint64)
+
+def hamming(words: Words, others: Words) -> NDArray[int64]:
+    """Popcount distance of a packed genome from every packed row of others"""
+    return popcount(words ^ others)
+
+def hamming_matrix(genes: NDArray[uint8], others: NDArray[uint8] | None = None, chunk_size = 1024) -> NDArray[int64]:
+    """Pairwise distances between the rows of two 0/1 genes matrices, genes against itself by default.
+    Computed as |a| + |b| - 2 a·b: a float32 matrix product, exact for genomes shorter than 2^24 loci,
+    is several times faster than popcounting every pair of packed rows"""
+
+    others = genes if others is None else others
+    right = others.astype(float32).T
+    others_ones = others.sum(axis = 1, dtype = int64)
+    distances = []
+    for start in range(0, len(genes), chunk_size):
+        chunk = genes[start:start + chunk_size]
+        common = (chunk.astype(float32) @ right).astype(int64)
+        distances.append(chunk.sum(axis = 1, dtype = int64)[:, None] + others_ones[None, :] - 2 * common)
+    return concatenate(distances)
+
+def diversity_index(genes: NDArray[uint8]) -> float:
+    """Average pairwise distance between different rows, relative to the genome length (0 = clones, 0.5 = random)"""
+
+    if len(genes) < 2:
+        return 0.
+    distances = hamming_matrix(genes)
+    return float(distances[triu_indices(len(genes), k = 1)].mean() / genes.shape[1])
+
+def nearest(words: Words, queries: Words, k = 1, chunk_size = 64) -> tuple[NDArray[int64], NDArray[int64]]:
+    """Indices and distances of the k packed rows of words closest to each packed query, closest first.
+    Queries are compared {chunk_size} at a time, so at most chunk_size x len(words) words are held at once"""
+
+    k = min(k, len(words))
+    indices, distances = [], []
+    for start in range(0, len(queries), chunk_size):
+        chunk_distances = hamming(queries[start:start + chunk_size, None, :], words[None, :, :])
+        closest = argpartition(chunk_distances, k - 1, axis = 1)[:, :k]
+        closest_distances = take_along_axis(chunk_distances, closest, axis = 1)
+        order = argsort(closest_distances, axis = 1, kind = 'stable')
+        indices.append(take_along_axis(closest, order, axis = 1))
+        distances.append(take_along_axis(closest_distances, order, axis = 1))
+    if not indices:
+        return empty((0, k), dtype = int64), empty((0, k), dtype = int64)
+    return concatenate(indices), concatenate(distances)
+
+def unique_rows(packed: NDArray[uint8] | Words) -> list[int]:
+    """Indices of the first occurrence of every distinct packed row, hashing each row as raw bytes"""
+
+    first: dict[bytes, int] = dict()
+    for i, row in enumerate(packed):
+        first.setdefault(row.tobytes(), i)
+    return list(first.values())
+
+def unique_genomes(genomes: list[Genome]) -> list[Genome]:
+    """Genomes without duplicates, in order of first occurrence. Genomes are told apart by their packed genes,
+    the fitness function is never hashed"""
+
+    first: dict[bytes, Genome] = dict()
+    for genome in genomes:
+        first.setdefault(genome.packed, genome)
+    return list(first.values())
@@ -0,0 +1,52 @@
+from __future__ import annotations
+from typing import Callable, TYPE_CHECKING
+from numpy import uint8, float64, empty, fromiter, packbits, stack
+from numpy.typing import NDArray
+from src.fitness_cache import FitnessCache, shared_cache
+
+if TYPE_CHECKING:
+    from src.genome import Genome
+
+def evaluate(genes: NDArray[uint8], fitness_fn: Callable[[list[int]], float]) -> NDArray[float64]:
+    """Fitness of every row of the matrix, in a single vectorized pass when fitness_fn has a batch entry point"""
+
+    batch = getattr(fitness_fn, 'batch', None)
+    if batch is not None:
+        return batch(genes)
+    return fromiter((fitness_fn(row.tolist()) for row in genes), dtype = float64, count = len(genes))
+
+def evaluate_cached(genes: NDArray[uint8], fitness_fn: Callable[[list[int]], float],
+                    cache: FitnessCache = shared_cache) -> NDArray[float64]:
+    """Like evaluate, only the rows missing from the cache (each distinct row once) reach fitness_fn"""
+
+    keys = [cache.key(fitness_fn, genes.shape[1], row.tobytes()) for row in packbits(genes, axis = 1)]
+    fitnesses = empty(len(genes))
+    missing: dict[tuple, list[int]] = dict()
+    for i, key in enumerate(keys):
+        if key in missing:
+            cache.hits += 1
+            missing[key].append(i)
+            continue
+        fitness = cache.get(key)
+        if fitness is None:
+            missing[key] = [i]
+        else:
+            fitnesses[i] = fitness
+    if missing:
+        rows = [indices[0] for indices in missing.values()]
+        for key, indices, fitness in zip(missing, missing.values(), evaluate(genes[rows], fitness_fn).tolist()):
+            fitnesses[indices] = fitness
+            cache.put(key, fitness)
+    return fitnesses
+
+def evaluate_genomes(genomes: list[Genome]) -> None:
+    """Scores at once every genome whose fitness is not known yet, Genome.fitness then returns the stored value"""
+
+    pending: dict[int, list[Genome]] = dict()
+    for genome in genomes:
+        if 'fitness' not in genome.__dict__:
+            pending.setdefault(id(genome.fitness_fn), []).append(genome)
+    for group in pending.values():
+        fitnesses = evaluate_cached(stack([genome.array for genome in group]), group[0].fitness_fn)
+        for genome, fitness in zip(group, fitnesses.tolist()):
+            genome.__dict__['fitness'] = fitness
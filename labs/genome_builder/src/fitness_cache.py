@@ -0,0 +1,87 @@
+from __future__ import annotations
+from typing import Callable
+from dataclasses import dataclass, field
+from collections import OrderedDict
+from itertools import count
+from weakref import ref
+
+Key = tuple[int, int, bytes] # problem token, genome length, bit-packed genes
+
+@dataclass
+class FitnessCache:
+    """Fitness values shared by all the genomes of all the problems, evicted least recently used first.
+    maxsize = None makes the cache unbounded, maxsize = 0 disables it"""
+
+    maxsize: int | None = 2 ** 14
+    hits: int = 0
+    misses: int = 0
+    _entries: OrderedDict[Key, float] = field(default_factory = OrderedDict, repr = False)
+    _problems: dict[int, tuple[Callable[[], object], int]] = field(default_factory = dict, repr = False)
+    _tokens: count = field(default_factory = count, repr = False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, fitness_fn: Callable[[list[int]], float], genome_length: int, packed_genes: bytes) -> Key:
+        return self.problem_token(fitness_fn), genome_length, packed_genes
+
+    def problem_token(self, fitness_fn: Callable[[list[int]], float]) -> int:
+        """Problem identity, the callable itself is never hashed: it is looked up by id and a weak reference
+        tells apart a new problem reusing the id of a garbage collected one"""
+
+        entry = self._problems.get(id(fitness_fn))
+        if entry is not None and entry[0]() is fitness_fn:
+            return entry[1]
+        try:
+            reference = ref(fitness_fn)
+        except TypeError: # not weak referenceable, kept alive instead
+            reference = lambda: fitness_fn
+        token = next(self._tokens)
+        self._problems[id(fitness_fn)] = reference, token
+        return token
+
+    def get(self, key: Key) -> float | None:
+        fitness = self._entries.get(key)
+        if fitness is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return fitness
+
+    def put(self, key: Key, fitness: float) -> None:
+        if self.maxsize == 0:
+            return
+        self._entries[key] = fitness
+        self._entries.move_to_end(key)
+        self.evict()
+
+    def evict(self) -> None:
+        if self.maxsize is None:
+            return
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last = False)
+
+    def resize(self, maxsize: int | None) -> None:
+        self.maxsize = maxsize
+        self.evict()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._problems.clear()
+        self.hits, self.misses = 0, 0
+
+    @property
+    def saved_calls(self) -> int:
+        """Calls to fitness_fn avoided thanks to the cache"""
+        return self.hits
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.
+
+    def __str__(self) -> str:
+        return f'{len(self)}/{self.maxsize} entries, hits: {self.hits}, misses: {self.misses}, hit rate: {self.hit_rate:.2%}'
+
+shared_cache = FitnessCache()
@@ -1,14 +1,41 @@
 from __future__ import annotations
 from src.chromosome import Chromosome, Mask
-from typing import Callable, Literal
-from dataclasses import dataclass
-from random import choice, choices, randint, shuffle
-from functools import cache
+from src.evaluation import evaluate_genomes, evaluate_cached
+from src.screening import screen_masks
+from src.instrumentation import operator, improvement, check_budget
+from typing import Callable, Literal, TYPE_CHECKING
+from dataclasses import FrozenInstanceError
+from random import choice, choices, randint, sample
+from functools import cached_property
+from numpy import array, count_nonzero, packbits, uint8
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from src.surrogate import LinearSurrogate
 
-@dataclass(frozen=True)
 class Genome():
-    genes: tuple[int, ...]
-    fitness_fn: Callable[[list[int]], float]
+    """Immutable 0/1 genes and the function scoring them. Genes are held as a tuple, as a uint8 array or both,
+    each is built from the other on first access. Genomes compare and hash by their packed genes"""
+
+    def __init__(self, genes: tuple[int, ...], fitness_fn: Callable[[list[int]], float]) -> None:
+        self.__dict__.update(genes = genes, fitness_fn = fitness_fn)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise FrozenInstanceError(f'cannot assign to field {name!r}')
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f'cannot delete field {name!r}')
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Genome):
+            return NotImplemented
+        return len(self.array) == len(other.array) and self.packed == other.packed and self.fitness_fn == other.fitness_fn
+
+    def __hash__(self) -> int:
+        return hash((len(self.array), self.packed, self.fitness_fn))
+
+    def __repr__(self) -> str:
+        return f'Genome({self.bits}, {self.fitness_fn!r})'
 
     # TODO: chromosome rct
 
@@ -16,6 +43,36 @@ class Genome():
     def random(length: int, fitness_fn: Callable[[list[int]], float]) -> Genome:
         return Genome(tuple(gene for gene in choices([0, 1], k = length)), fitness_fn)
 
+    @staticmethod
+    def from_array(row: NDArray[uint8], fitness_fn: Callable[[list[int]], float]) -> Genome:
+        """Genome over a row of an ArrayPopulation matrix, the row is kept as a read-only view"""
+
+        view = row.view()
+        view.flags.writeable = False
+        genome = Genome.__new__(Genome)
+        genome.__dict__.update(array = view, fitness_fn = fitness_fn)
+        return genome
+
+    @cached_property
+    def genes(self) -> tuple[int, ...]:
+        """Genes as a tuple, for genomes built from an array"""
+        return tuple(self.array.tolist())
+
+    @cached_property
+    def array(self) -> NDArray[uint8]:
+        """Genes as a 0/1 uint8 array"""
+        return array(self.genes, dtype = uint8)
+
+    @property
+    def bits(self) -> str:
+        """Genes as a string of 0 and 1"""
+        return (self.array + ord('0')).tobytes().decode()
+
+    @cached_property
+    def packed(self) -> bytes:
+        """Genes packed 8 per byte, a cheap key to hash and compare genomes"""
+        return packbits(self.array).tobytes()
+
     def combine_masked(self, other: Genome, mask: Mask) -> Genome:
         """Self.genes marked by positive values of mask are applied to a copy of other"""
 
@@ -45,74 +102,100 @@ class Genome():
             return Genome(tuple(child_genes), self.fitness_fn)
 
     def chromosome_fitness_gain(self, mask: Mask, random_genomes: list[Genome]) -> float:
-        """Measure the gain of applying the chromosome identified by the mask to a pool of random genomes"""
+        """Measure the gain of applying the chromosome identified by the mask to a pool of random genomes,
+        see screen_masks to measure many masks against the same pool"""
 
-        previous_average_fitness = sum([genome.fitness for genome in random_genomes]) / len(random_genomes)
-        random_with_chromosome = [self.combine_masked(other, mask) for other in random_genomes]
-        updated_average_fitness = sum([genome.fitness for genome in random_with_chromosome]) / len(random_with_chromosome)
-        return updated_average_fitness - previous_average_fitness
+        return screen_masks(self, [mask], random_genomes)[0].gain
+
+    def flip(self, loci: list[int]) -> Genome:
+        """Returns a new Genome with the genes at the given loci swapped"""
+
+        child_genes = list(self.genes)
+        for locus in loci:
+            child_genes[locus] ^= 1
+        return Genome(tuple(child_genes), self.fitness_fn)
 
     def simple_mutate(self) -> Genome:
-        length = len(self.genes)
+        length = len(self.array)
         changing_index = randint(0, length - 1)
-        child_genes = tuple(gene ^ 1 if i == changing_index else gene for i, gene in enumerate(self.genes))
-        return Genome(child_genes, self.fitness_fn)
+        return self.flip([changing_index])
 
-    def mutate(self) -> Genome:
-        """Swap a number of genes(loci) proportional to the distance from perfect fitness(=1)"""
+    def mutation_loci(self) -> list[int]:
+        """Loci to swap, their number is proportional to the distance from perfect fitness(=1)"""
 
         best_fitness_distance = 1 - self.fitness
-        genome_length = len(self.genes)
+        genome_length = len(self.array)
         mutations_count = round(genome_length * best_fitness_distance) or 1
-        mutations_mask = [True if i < mutations_count else False for i in range(genome_length)]
-        shuffle(mutations_mask)
-        child_genome = tuple((gene ^ 1) if mutations_mask[i] else gene for i, gene in enumerate(self.genes))
-        return Genome(child_genome, self.fitness_fn)
+        return sample(range(genome_length), mutations_count)
 
-    def climb_hill(self, max_steps = 100, max_non_improving_steps = 5, λ = 3) -> Genome:
+    def mutate(self) -> Genome:
+        """Swap a number of genes(loci) proportional to the distance from perfect fitness(=1)"""
+        return self.flip(self.mutation_loci())
+
+    def mutants(self, λ: int, incremental = True, surrogate: LinearSurrogate | None = None) -> list[Genome]:
+        """λ mutated children, scored. When incremental and the fitness function has a delta entry point
+        each child is scored updating the parent state in O(flipped loci) instead of from scratch.
+        With a surrogate only the children it selects are scored and returned"""
+
+        mutations = [self.mutation_loci() for _ in range(λ)]
+        children = [self.flip(loci) for loci in mutations]
+        if surrogate is not None:
+            selected = {id(child) for child in surrogate.select(children)}
+            mutations, children = zip(*[(loci, child) for loci, child in zip(mutations, children) if id(child) in selected])
+        delta = getattr(self.fitness_fn, 'delta', None)
+        if not incremental or delta is None:
+            evaluate_genomes(list(children))
+        else:
+            onemaxes = self.fitness_fn.onemaxes(self.array)
+            for loci, child in zip(mutations, children):
+                if 'fitness' not in child.__dict__: # may have been scored by a surrogate audit
+                    child.__dict__['fitness'], _ = delta(self.array, onemaxes, loci)
+        if surrogate is not None:
+            surrogate.learn(list(children))
+        return list(children)
+
+    def climb_hill(self, max_steps = 100, max_non_improving_steps = 5, λ = 3, incremental = True,
+                   surrogate: LinearSurrogate | None = None) -> Genome:
         """Optimizes local optimum, + strategy hill climber.
-        λ is the number of children, μ = 1"""
-
-        previous_fittest = None
-        fittest: Genome = self
-        non_improving_steps = 0
-        for _ in range(max_steps):
-            children = [self.mutate() for _ in range(λ)]
-            previous_fittest = fittest
-            fittest = max([fittest, *children], key = lambda genome: genome.fitness)
-            if fittest.fitness == previous_fittest.fitness:
-                non_improving_steps += 1
-            else:
-                non_improving_steps = 0
-            if non_improving_steps == max_non_improving_steps:
-                break
+        λ is the number of children, μ = 1. A surrogate, if given, decides which children are evaluated"""
+
+        with operator('climb_hill'):
+            previous_fittest = None
+            fittest: Genome = self
+            non_improving_steps = 0
+            for _ in range(max_steps):
+                check_budget()
+                children = self.mutants(λ, incremental, surrogate)
+                previous_fittest = fittest
+                fittest = max([fittest, *children], key = lambda genome: genome.fitness)
+                if fittest.fitness == previous_fittest.fitness:
+                    non_improving_steps += 1
+                else:
+                    non_improving_steps = 0
+                if non_improving_steps == max_non_improving_steps:
+                    break
+            improvement(fittest.fitness - self.fitness)
         return fittest
 
     def __str__(self) -> str:
-        return f"{''.join([str(gene) for gene in self.genes])}, fitness: {self.fitness:3.2%}"
+        return f'{self.bits}, fitness: {self.fitness:3.2%}'
 
-    @property
-    @cache
+    @cached_property
     def fitness(self) -> float:
-        genes_list: list[int] = [x for x in self.genes]
-        return self.fitness_fn(genes_list)
+        """Looked up in the shared fitness cache, fitness_fn is called only on a miss"""
+        return float(evaluate_cached(self.array[None, :], self.fitness_fn)[0])
 
     def distance(self, other: Genome, method: Literal['relative', 'absolute'] = 'relative') -> float | int:
         """method = 'absolute' returns int number of different genes, method = 'relative' returns float ratio
         (absolute distance / genome length)"""
 
-        if len(self.genes) != len(other.genes):
+        if len(self.array) != len(other.array):
             raise ValueError('Cannot evaluate distance between genomes of different length')
-        differences = 0
-        for i in range(len(self.genes)):
-            if self.genes[i] != other.genes[i]:
-                differences += 1
-            # benchmark against
-            # differences += self.genes[i] ^ other.genes[i]
+        differences = int(count_nonzero(self.array != other.array))
         if method == 'absolute':
             return differences
         elif method == 'relative':
-            return differences / len(self.genes)
+            return differences / len(self.array)
 
     def extract_chromosome(self, mask: Mask) -> Chromosome:
         """Extract a chromosome from genome"""
@@ -0,0 +1,165 @@
+from __future__ import annotations
+from typing import Iterator, TYPE_CHECKING
+from dataclasses import dataclass, field
+from contextlib import contextmanager
+from time import perf_counter
+from csv import DictWriter
+from json import dump
+
+if TYPE_CHECKING:
+    from src.population import Population
+
+class BudgetExhausted(Exception):
+    pass
+
+@dataclass
+class OperatorStats:
+    invocations: int = 0
+    calls: int = 0 # fitness calls made by the operator itself, nested operators excluded
+    seconds: float = 0.
+    improvement: float = 0.
+
+    @property
+    def improvement_per_call(self) -> float:
+        return self.improvement / self.calls if self.calls else 0.
+
+@dataclass
+class Frame:
+    name: str
+    calls: int
+    start: float
+    nested_calls: int = 0
+    nested_seconds: float = 0.
+
+@dataclass
+class Tracer:
+    """Attributes the fitness calls of a run to the operators using them and stops the run at a budget.
+
+    Operators are nested (e.g. 'children/climb_hill'), calls and time are charged to the innermost one.
+    Calls are read from the calls counter of the fitness function, as exposed by lab9 problems.
+    Activate with `with Tracer(problem, budget) as tracer:`, hooks are no-ops when no tracer is active"""
+
+    fitness_fn: object
+    budget: int | None = None
+    operators: dict[str, OperatorStats] = field(default_factory = dict)
+    trace: list[dict[str, float]] = field(default_factory = list)
+    _frames: list[Frame] = field(default_factory = list, repr = False)
+    _generation_calls: dict[str, int] = field(default_factory = dict, repr = False)
+    _generation_start: float = field(default_factory = perf_counter, repr = False)
+    _generation_start_calls: int = field(default = 0, repr = False)
+
+    def __enter__(self) -> Tracer:
+        global active
+        self._previous, active = active, self
+        self._generation_start, self._generation_start_calls = perf_counter(), self.calls
+        return self
+
+    def __exit__(self, *_) -> None:
+        global active
+        active = self._previous
+
+    @property
+    def calls(self) -> int:
+        return self.fitness_fn.calls
+
+    @property
+    def remaining(self) -> int | None:
+        return None if self.budget is None else self.budget - self.calls
+
+    def check_budget(self) -> None:
+        if self.budget is not None and self.calls >= self.budget:
+            raise BudgetExhausted(f'Budget of {self.budget} fitness calls exhausted')
+
+    @contextmanager
+    def operator(self, name: str) -> Iterator[None]:
+        self.check_budget()
+        path = f'{self._frames[-1].name}/{name}' if self._frames else name
+        frame = Frame(path, self.calls, perf_counter())
+        self._frames.append(frame)
+        try:
+            yield
+        finally:
+            self._frames.pop()
+            calls, seconds = self.calls - frame.calls, perf_counter() - frame.start
+            stats = self.operators.setdefault(path, OperatorStats())
+            stats.invocations += 1
+            stats.calls += calls - frame.nested_calls
+            stats.seconds += seconds - frame.nested_seconds
+            self._generation_calls[path] = self._generation_calls.get(path, 0) + calls - frame.nested_calls
+            if self._frames:
+                self._frames[-1].nested_calls += calls
+                self._frames[-1].nested_seconds += seconds
+
+    def improvement(self, delta: float) -> None:
+        """Fitness gained by the innermost running operator"""
+
+        if self._frames:
+            self.operators.setdefault(self._frames[-1].name, OperatorStats()).improvement += delta
+
+    def end_generation(self, population: Population) -> None:
+        now = perf_counter()
+        row: dict[str, float] = {
+            'generation': len(self.trace) + 1,
+            'calls': self.calls,
+            'generation_calls': self.calls - self._generation_start_calls,
+            'seconds': now - self._generation_start,
+            'best_fitness': population.best_genome.fitness,
+            'average_fitness': population.average_fitness,
+        }
+        row.update({f'calls:{name}': calls for name, calls in self._generation_calls.items()})
+        self.trace.append(row)
+        self._generation_calls, self._generation_start, self._generation_start_calls = dict(), now, self.calls
+
+    def export(self, path: str) -> None:
+        """Per-generation trace as csv, or as json when path ends with .json (together with operator totals)"""
+
+        if path.endswith('.json'):
+            with open(path, 'w') as file:
+                dump({'trace': self.trace, 'operators': {name: vars(stats) for name, stats in self.operators.items()}}, file, indent = 2)
+            return
+        columns = list(dict.fromkeys(column for row in self.trace for column in row))
+        with open(path, 'w', newline = '') as file:
+            writer = DictWriter(file, columns, restval = 0)
+            writer.writeheader()
+            writer.writerows(self.trace)
+
+    def __str__(self) -> str:
+        lines = [f'{"operator":<28}{"calls":>10}{"seconds":>10}{"gain/call":>12}']
+        for name, stats in sorted(self.operators.items(), key = lambda item: -item[1].calls):
+            lines.append(f'{name:<28}{stats.calls:>10}{stats.seconds:>10.2f}{stats.improvement_per_call:>12.2e}')
+        return '\n'.join(lines)
+
+active: Tracer | None = None
+
+@contextmanager
+def operator(name: str) -> Iterator[None]:
+    """Traces the enclosed code as operator {name} when a tracer is active"""
+
+    if active is None:
+        yield
+        return
+    with active.operator(name):
+        yield
+
+def improvement(delta: float) -> None:
+    if active is not None:
+        active.improvement(delta)
+
+def check_budget() -> None:
+    if active is not None:
+        active.check_budget()
+
+def end_generation(population: Population) -> None:
+    if active is not None:
+        active.end_generation(population)
+
+def evolve(population: Population, generations: int, **next_generation_kwargs) -> Population:
+    """Runs up to {generations} generations, stops early when the active tracer budget is exhausted
+    and returns the last complete generation"""
+
+    for _ in range(generations):
+        try:
+            population = population.next_generation(**next_generation_kwargs)
+        except BudgetExhausted:
+            break
+    return population
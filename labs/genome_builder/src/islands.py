@@ -0,0 +1,191 @@
+from __future__ import annotations
+from typing import Callable, Literal
+from dataclasses import dataclass, field
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from random import seed as seed_random, getstate, setstate
+from numpy import uint8, float64, array, concatenate, packbits, unpackbits
+from numpy.random import SeedSequence, default_rng
+from numpy.typing import NDArray
+from src.genome import Genome
+from src.diversity import unique_genomes
+from src.population import Population
+
+Topology = Literal['ring', 'complete', 'random']
+Migrants = tuple[NDArray[uint8], NDArray[float64]] # bit-packed genes (one row per genome), fitnesses
+
+@dataclass(frozen=True)
+class IslandStats:
+    island: int
+    generation: int
+    best_fitness: float
+    average_fitness: float
+
+    def __str__(self) -> str:
+        return f'Island {self.island:>2} generation {self.generation:>4} best: {self.best_fitness:.2%}, average: {self.average_fitness:.2%}'
+
+def pack(genomes: list[Genome]) -> Migrants:
+    packed = packbits([genome.array for genome in genomes], axis = 1)
+    return packed, array([genome.fitness for genome in genomes])
+
+def unpack(migrants: Migrants, length: int, fitness_fn: Callable[[list[int]], float]) -> list[Genome]:
+    packed, fitnesses = migrants
+    genomes = []
+    for row, fitness in zip(unpackbits(packed, axis = 1, count = length), fitnesses):
+        genome = Genome.from_array(row, fitness_fn)
+        genome.__dict__['fitness'] = float(fitness)
+        genomes.append(genome)
+    return genomes
+
+def _island(connection: Connection, genome_size: int, fitness_fn: Callable[[list[int]], float], population_size: int,
+            task_seed: int) -> None:
+    """Worker side: owns one Population and answers the commands of the Archipelago"""
+
+    seed_random(task_seed)
+    population = Population.initial(genome_size, fitness_fn, population_size)
+    reported_calls = 0
+    while True:
+        command, *arguments = connection.recv()
+        if command == 'evolve':
+            generations, migrants_count = arguments
+            for _ in range(generations):
+                population = population.next_generation()
+            ranked = sorted(population.genomes, key = lambda genome: genome.fitness, reverse = True)
+            calls = getattr(fitness_fn, 'calls', 0)
+            connection.send((ranked[0].fitness, population.average_fitness, pack(ranked[:migrants_count]), calls - reported_calls))
+            reported_calls = calls
+        elif command == 'immigrate':
+            immigrants = unpack(arguments[0], genome_size, fitness_fn)
+            pool = unique_genomes(population.genomes + immigrants)
+            population = Population(sorted(pool, key = lambda genome: genome.fitness, reverse = True)[:population_size])
+        elif command == 'genomes':
+            connection.send(pack(population.genomes))
+        elif command == 'state':
+            connection.send((pack(population.genomes), getstate()))
+        elif command == 'restore':
+            migrants, random_state = arguments
+            population = Population(unpack(migrants, genome_size, fitness_fn))
+            setstate(random_state)
+        elif command == 'stop':
+            connection.close()
+            return
+
+@dataclass
+class Archipelago:
+    """Island model: {islands} populations evolve in separate processes and every {migration_interval} generations
+    each island sends its best {migrants} genomes, bit-packed, to its neighbours in the topology.
+    fitness_fn must be picklable, lab9_lib problems are rebuilt in the workers by make_problem"""
+
+    islands: int
+    genome_size: int
+    fitness_fn: Callable[[list[int]], float]
+    population_size: int = 30
+    migration_interval: int = 5
+    migrants: int = 2
+    topology: Topology = 'ring'
+    seed: int | None = None
+    generation: int = 0
+    history: list[list[IslandStats]] = field(default_factory = list)
+    _connections: list[Connection] = field(default_factory = list, repr = False)
+    _processes: list[Process] = field(default_factory = list, repr = False)
+
+    def __post_init__(self):
+        if self.topology not in ['ring', 'complete', 'random']:
+            raise ValueError(f'Topology {self.topology} not valid')
+        seeds = SeedSequence(self.seed)
+        self._rng = default_rng(seeds.spawn(1)[0])
+        for island_seed in seeds.spawn(self.islands):
+            connection, worker_connection = Pipe()
+            process = Process(target = _island, daemon = True, args = (worker_connection, self.genome_size, self.fitness_fn,
+                                                                       self.population_size, int(island_seed.generate_state(1)[0])))
+            process.start()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+    def __enter__(self) -> Archipelago:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def sources(self, island: int) -> list[int]:
+        """Islands sending their migrants to {island}"""
+
+        if self.islands == 1:
+            return []
+        if self.topology == 'ring':
+            return [(island - 1) % self.islands]
+        if self.topology == 'complete':
+            return [other for other in range(self.islands) if other != island]
+        other = int(self._rng.integers(0, self.islands - 1))
+        return [other if other < island else other + 1]
+
+    def epoch(self) -> list[IslandStats]:
+        """Evolves every island for migration_interval generations, then migrates"""
+
+        for connection in self._connections:
+            connection.send(('evolve', self.migration_interval, self.migrants))
+        replies = [connection.recv() for connection in self._connections]
+        self.generation += self.migration_interval
+        stats = [IslandStats(i, self.generation, best, average) for i, (best, average, _, _) in enumerate(replies)]
+        if hasattr(self.fitness_fn, 'add_calls'):
+            self.fitness_fn.add_calls(sum(calls for *_, calls in replies))
+        for island, connection in enumerate(self._connections):
+            sources = self.sources(island)
+            if not sources:
+                continue
+            packed = concatenate([replies[source][2][0] for source in sources])
+            fitnesses = concatenate([replies[source][2][1] for source in sources])
+            connection.send(('immigrate', (packed, fitnesses)))
+        self.history.append(stats)
+        return stats
+
+    def run(self, epochs: int) -> list[IslandStats]:
+        """Stats of every island after the last epoch"""
+
+        for _ in range(epochs):
+            self.epoch()
+        return self.history[-1] if self.history else []
+
+    def populations(self) -> list[Population]:
+        populations = []
+        for connection in self._connections:
+            connection.send(('genomes',))
+            populations.append(Population(unpack(connection.recv(), self.genome_size, self.fitness_fn)))
+        return populations
+
+    def states(self) -> list[tuple[Population, tuple]]:
+        """Population and random module state of every island"""
+
+        states = []
+        for connection in self._connections:
+            connection.send(('state',))
+            migrants, random_state = connection.recv()
+            states.append((Population(unpack(migrants, self.genome_size, self.fitness_fn)), random_state))
+        return states
+
+    def restore(self, states: list[tuple[Population, tuple]]) -> None:
+        """Replaces population and random state of every island, see states"""
+
+        for connection, (population, random_state) in zip(self._connections, states):
+            connection.send(('restore', pack(population.genomes), random_state))
+
+    @property
+    def migration_state(self) -> dict:
+        """State of the generator drawing the sources of the random topology"""
+        return self._rng.bit_generator.state
+
+    @migration_state.setter
+    def migration_state(self, state: dict) -> None:
+        self._rng.bit_generator.state = state
+
+    @property
+    def best_genome(self) -> Genome:
+        return max((population.best_genome for population in self.populations()), key = lambda genome: genome.fitness)
+
+    def close(self) -> None:
+        for connection in self._connections:
+            connection.send(('stop',))
+        for process in self._processes:
+            process.join()
+        self._connections, self._processes = [], []
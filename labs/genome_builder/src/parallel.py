@@ -0,0 +1,80 @@
+from __future__ import annotations
+from typing import Callable
+from dataclasses import dataclass, field
+from concurrent.futures import Executor, ProcessPoolExecutor
+from random import seed as seed_random
+from numpy import uint8, packbits, unpackbits, frombuffer
+from numpy.random import SeedSequence
+from src.genome import Genome
+
+ClimbResult = tuple[bytes, float, int] # packed genes, fitness, fitness calls
+
+def _climb(packed: bytes | None, length: int, fitness_fn: Callable[[list[int]], float], task_seed: int,
+           climb_kwargs: dict) -> ClimbResult:
+    """Worker side: hill climbs the given genome, or a new random one when packed is None"""
+
+    seed_random(task_seed)
+    calls = getattr(fitness_fn, 'calls', 0)
+    if packed is None:
+        genome = Genome.random(length, fitness_fn)
+    else:
+        genome = Genome.from_array(unpackbits(frombuffer(packed, dtype = uint8), count = length), fitness_fn)
+    fittest = genome.climb_hill(**climb_kwargs)
+    return packbits(fittest.array).tobytes(), fittest.fitness, getattr(fitness_fn, 'calls', 0) - calls
+
+@dataclass
+class HillClimbPool:
+    """Runs independent hill climbs on a pool of processes. Every task is seeded from its own child of seed,
+    spawned in submission order, so results do not depend on scheduling nor on the number of workers.
+    fitness_fn must be picklable, lab9_lib problems are rebuilt in the workers by make_problem"""
+
+    max_workers: int | None = None
+    seed: int | None = None
+    climb_kwargs: dict = field(default_factory = dict)
+    _seeds: SeedSequence = field(init = False, repr = False)
+    _executor: Executor | None = field(default = None, init = False, repr = False)
+
+    def __post_init__(self):
+        self._seeds = SeedSequence(self.seed)
+
+    def __enter__(self) -> HillClimbPool:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.max_workers)
+        return self._executor
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _run(self, tasks: list[bytes | None], length: int, fitness_fn: Callable[[list[int]], float]) -> list[Genome]:
+        task_seeds = [int(child.generate_state(1)[0]) for child in self._seeds.spawn(len(tasks))]
+        results = self.executor.map(_climb, tasks, [length] * len(tasks), [fitness_fn] * len(tasks), task_seeds,
+                                    [self.climb_kwargs] * len(tasks))
+        climbers = []
+        for packed, fitness, calls in results:
+            climber = Genome.from_array(unpackbits(frombuffer(packed, dtype = uint8), count = length), fitness_fn)
+            climber.__dict__['fitness'] = fitness
+            climbers.append(climber)
+            if hasattr(fitness_fn, 'add_calls'):
+                fitness_fn.add_calls(calls)
+        return climbers
+
+    def climb(self, genomes: list[Genome]) -> list[Genome]:
+        """Genome.climb_hill of every genome, in parallel"""
+
+        if not genomes:
+            return []
+        tasks: list[bytes | None] = [packbits(genome.array).tobytes() for genome in genomes]
+        return self._run(tasks, len(genomes[0].array), genomes[0].fitness_fn)
+
+    def climb_random(self, count: int, length: int, fitness_fn: Callable[[list[int]], float]) -> list[Genome]:
+        """Hill climbs {count} random genomes, generated in the workers"""
+        return self._run([None] * count, length, fitness_fn)
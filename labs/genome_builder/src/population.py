@@ -1,17 +1,27 @@
 from __future__ import annotations
-from typing import Callable
+from typing import Callable, TYPE_CHECKING
 from dataclasses import dataclass
 from src.genome import Genome
-from random import choices
-from functools import cache
+from src.evaluation import evaluate_genomes
+from src.diversity import diversity_index, unique_genomes
+from src.selection import tournament
+from src.instrumentation import operator, end_generation
+from random import getrandbits
+from numpy import array, stack
+from numpy.random import default_rng
+
+if TYPE_CHECKING:
+    from src.parallel import HillClimbPool
+    from src.surrogate import LinearSurrogate
 
 def tournament_selection(population: list[Genome], selected_count: int, tournament_size = 2) -> list[Genome]:
-    """Selects from the population a number of {selected_count} individuals"""
+    """Selects from the population a number of {selected_count} individuals, random draws come from the random
+    module so that seeding it makes the selection reproducible"""
 
-    contendants: list[Genome] = choices(population, k= selected_count * tournament_size)
-    torunaments = [tuple(contendants[i:(i + tournament_size)]) for i in range(selected_count)]
-    winners = [max(t, key= lambda g: g.fitness) for t in torunaments]
-    return winners
+    evaluate_genomes(population)
+    fitnesses = array([genome.fitness for genome in population])
+    winners = tournament(fitnesses, selected_count, tournament_size, default_rng(getrandbits(64)))
+    return [population[i] for i in winners.tolist()]
 
 @dataclass
 class Population:
@@ -22,7 +32,7 @@ class Population:
 
         parent_count = children_count * 2 # two parent x-over
         parents = tournament_selection(self.genomes, selected_count = parent_count)
-        couples = [tuple(parents[i:(i + 2)]) for i in range(children_count)]
+        couples = [tuple(parents[2 * i:2 * i + 2]) for i in range(children_count)]
         couples = [couple for couple in couples if couple[0]!=couple[1]] # recombining element with itself makes no sense
         children = [couple[0].combine(couple[1]) for couple in couples]
         return children
@@ -40,22 +50,46 @@ class Population:
                 raise ValueError('Finding two different elements to recombine takes too long')
         return children
 
-    def next_generation(self) -> Population:
+    def next_generation(self, pool: HillClimbPool | None = None, surrogate: LinearSurrogate | None = None) -> Population:
+        """When a pool is given the hill climbs of children and new random genomes run in parallel.
+        A surrogate, if given, picks which recombined children are evaluated and climbed, and which mutants
+        are evaluated during the (sequential) hill climbs"""
+
         population_size = len(self.genomes)
-        genome_params = len(self.best_genome.genes), self.best_genome.fitness_fn
-        children = [child.climb_hill() for child in self.recombination2(20)]
-        new_genomes = [Genome.random(*genome_params).climb_hill() for _ in range(4)]
-        unique_genes = set(self.genomes + children + new_genomes)
+        genome_params = len(self.best_genome.array), self.best_genome.fitness_fn
+        with operator('recombination'):
+            recombined = self.recombination2(20)
+            if surrogate is None:
+                evaluate_genomes(recombined)
+            else:
+                recombined = surrogate.screen(recombined)
+        with operator('immigration'):
+            randoms = [Genome.random(*genome_params) for _ in range(4)] if pool is None else []
+            evaluate_genomes(randoms)
+        with operator('children'):
+            children = [child.climb_hill(surrogate = surrogate) for child in recombined] if pool is None else pool.climb(recombined)
+        with operator('immigrants'):
+            new_genomes = [random.climb_hill(surrogate = surrogate) for random in randoms] if pool is None else pool.climb_random(4, *genome_params)
+        unique_genes = unique_genomes(self.genomes + children + new_genomes) # insertion ordered, ties are ranked reproducibly
         selection_pool: list[Genome] = sorted([x for x in unique_genes], key= lambda genome: genome.fitness, reverse=True) # [*self.genomes, *optimized_children]
-        return Population(selection_pool[0: population_size])
+        next_population = Population(selection_pool[0: population_size])
+        end_generation(next_population)
+        return next_population
 
     @property
     def average_fitness(self) -> float:
+        evaluate_genomes(self.genomes)
         return sum([genome.fitness for genome in self.genomes]) / len(self.genomes)
 
+    @property
+    def diversity(self) -> float:
+        """Average pairwise distance relative to the genome length, see diversity_index"""
+        return diversity_index(stack([genome.array for genome in self.genomes]))
+
     @property
     # @cache TODO: in order to use population must be hashable
     def best_genome(self) -> Genome:
+        evaluate_genomes(self.genomes)
         return max(self.genomes, key = lambda genome: genome.fitness)
 
     @staticmethod
@@ -67,7 +101,11 @@ class Population:
         return Population(randoms)
 
     @staticmethod
-    def initial(genome_size: int, fitness_fn: Callable[[list[int]], float], population_size = 30) -> Population:
+    def initial(genome_size: int, fitness_fn: Callable[[list[int]], float], population_size = 30,
+                pool: HillClimbPool | None = None) -> Population:
+        if pool is not None:
+            return Population(pool.climb_random(population_size, genome_size, fitness_fn))
         random_population = Population.random(genome_size, fitness_fn, population_size)
+        evaluate_genomes(random_population.genomes)
         climbers = [random.climb_hill() for random in random_population.genomes]
         return Population(climbers)
\ No newline at end of file
@@ -0,0 +1,53 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from numpy import bool_, arange, asarray, float64, sqrt, stack, where, zeros
+from numpy.typing import NDArray
+from src.chromosome import Mask
+from src.evaluation import evaluate, evaluate_genomes
+
+if TYPE_CHECKING:
+    from src.genome import Genome
+
+@dataclass(frozen=True)
+class Gain:
+    """Gain of a mask: average fitness increase of the random genomes receiving the chromosome of the donor"""
+
+    mask_index: int
+    gain: float
+    samples: int # random genomes the mask was applied to
+    pruned: bool # stopped early, clearly worse than the best mask
+
+def screen_masks(donor: Genome, masks: NDArray[bool_] | list[Mask], random_genomes: list[Genome],
+                 batch_size: int | None = None, confidence = 3.) -> list[Gain]:
+    """Gain table of many masks against one shared pool of random genomes, ranked from the best mask
+    (pruned masks last).
+
+    The baseline fitness of the pool is computed once and every mask is applied to a batch of the pool at
+    once. When batch_size is given the pool is consumed {batch_size} genomes at a time and a mask stops being
+    scored as soon as its gain upper bound (mean + confidence standard errors) falls below the lower bound of
+    the best mask, so clearly worse masks cost a fraction of the fitness calls"""
+
+    masks = asarray(masks, dtype = bool)
+    evaluate_genomes(random_genomes)
+    pool = stack([genome.array for genome in random_genomes])
+    baseline = asarray([genome.fitness for genome in random_genomes])
+    batch_size = batch_size or len(pool)
+    sums, squares, samples = zeros(len(masks)), zeros(len(masks)), zeros(len(masks), dtype = int)
+    active = arange(len(masks))
+    for start in range(0, len(pool), batch_size):
+        batch = pool[start:start + batch_size]
+        children = where(masks[active, None, :], donor.array, batch)
+        fitnesses = evaluate(children.reshape(-1, pool.shape[1]), donor.fitness_fn).reshape(len(active), len(batch))
+        gains: NDArray[float64] = fitnesses - baseline[start:start + batch_size]
+        sums[active] += gains.sum(axis = 1)
+        squares[active] += (gains ** 2).sum(axis = 1)
+        samples[active] += len(batch)
+        if samples[active[0]] < 2 or len(active) < 2:
+            continue
+        means = sums[active] / samples[active]
+        errors = sqrt((squares[active] / samples[active] - means ** 2).clip(min = 0) / (samples[active] - 1))
+        active = active[means + confidence * errors >= (means - confidence * errors).max()]
+    pruned = set(range(len(masks))) - set(active.tolist())
+    table = [Gain(i, float(sums[i] / samples[i]), int(samples[i]), i in pruned) for i in range(len(masks))]
+    return sorted(table, key = lambda entry: (not entry.pruned, entry.gain), reverse = True)
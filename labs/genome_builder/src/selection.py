@@ -0,0 +1,38 @@
+from __future__ import annotations
+from numpy import float64, intp, arange, argmax, argsort, full
+from numpy.random import Generator, default_rng
+from numpy.typing import NDArray
+
+Fitnesses = NDArray[float64]
+Indices = NDArray[intp]
+
+def tournament(fitnesses: Fitnesses, selected_count: int, tournament_size = 2, rng: Generator | None = None) -> Indices:
+    """Winners of {selected_count} independent tournaments among {tournament_size} contendants drawn with replacement"""
+
+    rng = rng or default_rng()
+    contendants = rng.integers(0, len(fitnesses), size = (selected_count, tournament_size))
+    winners = argmax(fitnesses[contendants], axis = 1)
+    return contendants[arange(selected_count), winners]
+
+def truncation(fitnesses: Fitnesses, selected_count: int) -> Indices:
+    """The {selected_count} fittest, best first, cycling over the population if more are requested than available"""
+
+    ranked = argsort(-fitnesses, kind = 'stable')
+    return ranked[arange(selected_count) % len(ranked)]
+
+def rank(fitnesses: Fitnesses, selected_count: int, rng: Generator | None = None) -> Indices:
+    """Linear ranking, the probability of being selected is proportional to the rank (1 for the least fit)"""
+
+    rng = rng or default_rng()
+    ranks = full(len(fitnesses), 0.)
+    ranks[argsort(fitnesses, kind = 'stable')] = arange(1, len(fitnesses) + 1)
+    return rng.choice(len(fitnesses), size = selected_count, p = ranks / ranks.sum())
+
+def roulette(fitnesses: Fitnesses, selected_count: int, rng: Generator | None = None) -> Indices:
+    """Fitness proportionate selection, fitnesses are shifted to be non negative, uniform if all equal"""
+
+    rng = rng or default_rng()
+    weights = fitnesses - min(fitnesses.min(), 0)
+    if not weights.sum():
+        return rng.integers(0, len(fitnesses), size = selected_count)
+    return rng.choice(len(fitnesses), size = selected_count, p = weights / weights.sum())
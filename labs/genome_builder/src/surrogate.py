@@ -0,0 +1,106 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+from dataclasses import dataclass, field
+from math import ceil
+from numpy import float64, argsort, sign, stack, triu_indices, zeros
+from numpy.random import Generator, default_rng
+from numpy.typing import NDArray
+from src.evaluation import evaluate_genomes
+
+if TYPE_CHECKING:
+    from src.genome import Genome
+
+@dataclass
+class SurrogateStats:
+    candidates: int = 0 # genomes ranked by the surrogate
+    evaluated: int = 0 # genomes that got a real evaluation because the surrogate selected them
+    compared_pairs: int = 0
+    discordant_pairs: int = 0 # pairs of evaluated genomes ranked the other way round by the surrogate
+    audits: int = 0 # rejected genomes evaluated anyway to check the surrogate
+    wrong_rejections: int = 0 # audited genomes that were better than the worst selected one
+
+    @property
+    def saved_evaluations(self) -> int:
+        """Candidates never passed to the fitness function, audits are real evaluations"""
+        return self.candidates - self.evaluated - self.audits
+
+    @property
+    def discordance(self) -> float:
+        return self.discordant_pairs / self.compared_pairs if self.compared_pairs else 0.
+
+    @property
+    def wrong_rejection_rate(self) -> float:
+        return self.wrong_rejections / self.audits if self.audits else 0.
+
+    def __str__(self) -> str:
+        return (f'saved {self.saved_evaluations}/{self.candidates} evaluations, discordant pairs: {self.discordance:.2%}, '
+                f'wrong rejections: {self.wrong_rejections}/{self.audits}')
+
+@dataclass
+class LinearSurrogate:
+    """Per-locus linear model of the fitness, learned online (normalized least mean squares) from every genome
+    that gets a real evaluation. It ranks candidates so that only the most promising {fraction} of them is
+    evaluated; during the first {warmup} evaluations every candidate is. A rejected candidate is evaluated
+    anyway with probability {audit_rate}, to measure how often the surrogate throws away a good genome"""
+
+    genome_length: int
+    fraction: float = .5
+    learning_rate: float = .5
+    warmup: int = 100
+    audit_rate: float = 0.
+    rng: Generator = field(default_factory = default_rng, repr = False)
+    stats: SurrogateStats = field(default_factory = SurrogateStats)
+    weights: NDArray[float64] = field(init = False, repr = False)
+    bias: float = field(default = 0., init = False)
+    samples: int = field(default = 0, init = False)
+
+    def __post_init__(self):
+        self.weights = zeros(self.genome_length)
+
+    def predict(self, genomes: list[Genome]) -> NDArray[float64]:
+        return stack([genome.array for genome in genomes]) @ self.weights + self.bias
+
+    def learn(self, genomes: list[Genome]) -> None:
+        """Updates the model with scored genomes, counting first how many pairs it would have ranked wrongly"""
+
+        if not genomes:
+            return
+        fitnesses = [genome.fitness for genome in genomes]
+        predictions = self.predict(genomes)
+        if len(genomes) > 1 and self.samples >= self.warmup:
+            pairs = triu_indices(len(genomes), k = 1)
+            real_order = sign([fitnesses[i] - fitnesses[j] for i, j in zip(*pairs)])
+            predicted_order = sign(predictions[pairs[0]] - predictions[pairs[1]])
+            self.stats.compared_pairs += int((real_order != 0).sum())
+            self.stats.discordant_pairs += int((real_order * predicted_order < 0).sum())
+        for genome, fitness, prediction in zip(genomes, fitnesses, predictions):
+            error = fitness - prediction
+            self.weights += self.learning_rate * error * genome.array / (genome.array.sum() + 1)
+            self.bias += self.learning_rate * error / (genome.array.sum() + 1)
+            self.samples += 1
+
+    def select(self, candidates: list[Genome]) -> list[Genome]:
+        """The candidates worth a real evaluation, best predicted first"""
+
+        self.stats.candidates += len(candidates)
+        if self.samples < self.warmup or len(candidates) < 2:
+            self.stats.evaluated += len(candidates)
+            return candidates
+        ranked = [candidates[i] for i in argsort(-self.predict(candidates), kind = 'stable')]
+        selected_count = max(1, ceil(len(candidates) * self.fraction))
+        selected, rejected = ranked[:selected_count], ranked[selected_count:]
+        self.stats.evaluated += selected_count
+        if rejected and self.rng.random() < self.audit_rate:
+            audited = rejected[int(self.rng.integers(0, len(rejected)))]
+            evaluate_genomes(selected + [audited])
+            self.stats.audits += 1
+            self.stats.wrong_rejections += audited.fitness > min(genome.fitness for genome in selected)
+        return selected
+
+    def screen(self, candidates: list[Genome]) -> list[Genome]:
+        """Selects the promising candidates, evaluates them and learns from them"""
+
+        selected = self.select(candidates)
+        evaluate_genomes(selected)
+        self.learn(selected)
+        return selected
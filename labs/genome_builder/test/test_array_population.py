@@ -0,0 +1,53 @@
+from numpy import array, uint8
+from numpy.random import default_rng
+from src.array_population import ArrayPopulation, combine, mutate
+from src.genome import Genome
+from src.population import Population
+
+def simple_fitness(genes: list[int]):
+    return sum(genes) / len(genes)
+
+def test_genome_view():
+    population = ArrayPopulation(array([[0,1,1],[1,0,0]], dtype = uint8), simple_fitness)
+    assert population[0] == Genome((0,1,1), simple_fitness)
+    assert population[1].array.base is not None
+
+def test_genome_view_builds_genes_lazily():
+    population = ArrayPopulation(array([[0,1,1],[1,0,0],[0,1,1]], dtype = uint8), simple_fitness)
+    genome = population[0]
+    assert genome.fitness == 2 / 3 and genome.distance(genome) == 0
+    assert genome == population[2] and genome != population[1] and len({genome, population[2]}) == 1
+    assert repr(genome).startswith('Genome(011,')
+    assert 'genes' not in genome.__dict__
+    assert genome.genes == (0, 1, 1)
+
+def test_population_roundtrip():
+    population = Population.random(50, simple_fitness, population_size = 5)
+    array_population = ArrayPopulation.from_population(population)
+    assert array_population.to_population() == population
+    assert ArrayPopulation.from_packed(array_population.packed(), 50, simple_fitness).to_population() == population
+
+def test_combine_takes_genes_from_parents():
+    rng = default_rng(0)
+    first, second = rng.integers(0, 2, size = (10, 100), dtype = uint8), rng.integers(0, 2, size = (10, 100), dtype = uint8)
+    child = combine(first, second, rng)
+    assert ((child == first) | (child == second)).all()
+
+def test_mutate_flips_at_least_one_locus():
+    rng = default_rng(0)
+    genes = rng.integers(0, 2, size = (10, 100), dtype = uint8)
+    mutated = mutate(genes, array([0.] * 10), rng)
+    assert ((mutated != genes).sum(axis = 1) == 1).all()
+
+def test_next_generation_does_not_get_worse():
+    population = ArrayPopulation.initial(100, simple_fitness, population_size = 10, rng = default_rng(0))
+    next_population = population.next_generation()
+    assert len(next_population) == 10
+    assert next_population.fitnesses.max() >= population.fitnesses.max()
+    assert (next_population.fitnesses == [g.fitness for g in next_population.genomes]).all()
+
+def test_recombination_couples_disjoint_parents(monkeypatch):
+    parents = [Genome((i, 0), simple_fitness) for i in range(2)] + [Genome((i, 1), simple_fitness) for i in range(2)]
+    monkeypatch.setattr('src.population.tournament_selection', lambda genomes, selected_count: parents[:selected_count])
+    monkeypatch.setattr(Genome, 'combine', lambda self, other: (self, other))
+    assert Population(parents).recombination(2) == [(parents[0], parents[1]), (parents[2], parents[3])]
@@ -0,0 +1,56 @@
+from random import seed
+from lab9_lib import make_problem
+from src.checkpoint import save, load, save_archipelago, load_archipelago
+from src.islands import Archipelago
+from src.population import Population
+
+def test_resumed_run_continues_identically(tmp_path):
+    seed(0)
+    problem = make_problem(2)
+    population = Population.initial(60, problem, population_size = 5)
+    save(tmp_path, population, generation = 3)
+    expected = population.next_generation()
+
+    resumed_problem = make_problem(2)
+    checkpoint = load(tmp_path, resumed_problem)
+    assert checkpoint.generation == 3
+    assert resumed_problem.calls == checkpoint.calls
+    assert [g.fitness for g in checkpoint.population.genomes] == [g.fitness for g in population.genomes]
+    assert resumed_problem.calls == checkpoint.calls # fitnesses come from the checkpoint
+    resumed = checkpoint.population.next_generation()
+    assert [g.genes for g in resumed.genomes] == [g.genes for g in expected.genomes]
+    assert resumed_problem.calls == problem.calls
+
+def test_archipelago_checkpoint(tmp_path):
+    problem = make_problem(1)
+    with Archipelago(2, 40, problem, population_size = 4, migration_interval = 1, seed = 0) as archipelago:
+        archipelago.run(1)
+        save_archipelago(tmp_path, archipelago)
+        populations = archipelago.populations()
+    resumed_problem = make_problem(1)
+    with Archipelago(2, 40, resumed_problem, population_size = 4, migration_interval = 1, seed = 1) as resumed:
+        load_archipelago(tmp_path, resumed)
+        assert resumed.generation == 1 and len(resumed.history) == 1
+        assert [[g.genes for g in p.genomes] for p in resumed.populations()] == [[g.genes for g in p.genomes] for p in populations]
+
+def test_save_replaces_previous_checkpoint(tmp_path):
+    problem = make_problem(1)
+    first, second = Population.random(40, problem, population_size = 4), Population.random(24, problem, population_size = 6)
+    save(tmp_path / 'checkpoint', first, generation = 1)
+    save(tmp_path / 'checkpoint', second, generation = 2)
+    checkpoint = load(tmp_path / 'checkpoint', problem, restore_random = False)
+    assert checkpoint.generation == 2
+    assert [g.genes for g in checkpoint.population.genomes] == [g.genes for g in second.genomes]
+    assert [entry.name for entry in tmp_path.iterdir()] == ['checkpoint']
+
+def test_resumed_random_topology_continues_identically(tmp_path):
+    problem = make_problem(1)
+    with Archipelago(3, 40, problem, population_size = 4, migration_interval = 1, topology = 'random', seed = 0) as archipelago:
+        archipelago.run(1)
+        save_archipelago(tmp_path, archipelago)
+        archipelago.run(2)
+        populations = archipelago.populations()
+    with Archipelago(3, 40, make_problem(1), population_size = 4, migration_interval = 1, topology = 'random', seed = 1) as resumed:
+        load_archipelago(tmp_path, resumed)
+        resumed.run(2)
+        assert [[g.genes for g in p.genomes] for p in resumed.populations()] == [[g.genes for g in p.genomes] for p in populations]
@@ -0,0 +1,35 @@
+from numpy import uint8, take_along_axis
+from numpy.random import default_rng
+from src.diversity import pack, hamming, hamming_matrix, diversity_index, nearest, unique_rows, unique_genomes
+from src.genome import Genome
+
+def simple_fitness(genes: list[int]):
+    return sum(genes) / len(genes)
+
+def test_hamming_matrix_matches_popcount_and_distance():
+    genes = default_rng(0).integers(0, 2, size = (20, 77), dtype = uint8)
+    distances = hamming_matrix(genes, chunk_size = 8)
+    words = pack(genes)
+    for i in range(20):
+        assert (hamming(words[i], words) == distances[i]).all()
+    first, second = Genome.from_array(genes[0], simple_fitness), Genome.from_array(genes[1], simple_fitness)
+    assert first.distance(second, method = 'absolute') == distances[0, 1]
+
+def test_diversity_index():
+    genes = default_rng(0).integers(0, 2, size = (2, 8), dtype = uint8)
+    genes[1] = 1 - genes[0]
+    assert diversity_index(genes) == 1.
+    assert diversity_index(genes[[0, 0]]) == 0.
+
+def test_nearest_and_unique():
+    genes = default_rng(0).integers(0, 2, size = (10, 100), dtype = uint8)
+    genes[7] = genes[2]
+    words = pack(genes)
+    indices, distances = nearest(words, words[[3]], k = 2)
+    assert indices[0, 0] == 3 and distances[0, 0] == 0
+    indices, distances = nearest(words, words, k = 3, chunk_size = 4)
+    assert (distances == [sorted(hamming(word, words).tolist())[:3] for word in words]).all()
+    assert (take_along_axis(hamming_matrix(genes), indices, axis = 1) == distances).all()
+    assert unique_rows(words) == [0, 1, 2, 3, 4, 5, 6, 8, 9]
+    genomes = [Genome.from_array(row, simple_fitness) for row in genes]
+    assert unique_genomes(genomes) == [genomes[i] for i in unique_rows(words)]
@@ -0,0 +1,40 @@
+from numpy import uint8
+from numpy.random import default_rng
+from lab9_lib import make_problem
+from src.evaluation import evaluate, evaluate_genomes
+from src.genome import Genome
+from src.population import Population
+
+def test_batch_matches_scalar_fitness():
+    rng = default_rng(0)
+    for size in (1, 2, 5, 10):
+        problem = make_problem(size)
+        genes = rng.integers(0, 2, size = (50, 103), dtype = uint8)
+        genes[0] = 1
+        batch_fitnesses = problem.batch(genes)
+        assert batch_fitnesses.tolist() == [problem(row.tolist()) for row in genes]
+        assert problem.calls == 100
+
+def test_evaluate_without_batch_entry_point():
+    genes = default_rng(0).integers(0, 2, size = (5, 10), dtype = uint8)
+    assert evaluate(genes, lambda genes: sum(genes) / len(genes)).tolist() == (genes.sum(axis = 1) / 10).tolist()
+
+def test_population_scored_in_one_batch():
+    problem = make_problem(2)
+    population = Population.random(100, problem, population_size = 10)
+    evaluate_genomes(population.genomes)
+    assert problem.calls == 10
+    assert population.average_fitness == sum(problem(list(genome.genes)) for genome in population.genomes) / 10
+    assert problem.calls == 20
+
+def test_delta_matches_full_evaluation():
+    for size in (1, 2, 5, 10):
+        problem = make_problem(size)
+        genome = Genome.random(101, problem)
+        onemaxes = problem.onemaxes(genome.genes)
+        for _ in range(20):
+            loci = genome.mutation_loci()
+            fitness, child_onemaxes = problem.delta(genome.genes, onemaxes, loci)
+            child = genome.flip(loci)
+            assert fitness == problem(list(child.genes))
+            assert child_onemaxes == problem.onemaxes(child.genes)
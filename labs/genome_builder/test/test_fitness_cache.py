@@ -0,0 +1,27 @@
+from lab9_lib import make_problem
+from src.fitness_cache import FitnessCache, shared_cache
+from src.genome import Genome
+
+def test_lru_eviction():
+    cache = FitnessCache(maxsize = 2)
+    problem = make_problem(1)
+    keys = [cache.key(problem, 8, bytes([i])) for i in range(3)]
+    cache.put(keys[0], 0.)
+    cache.put(keys[1], 1.)
+    assert cache.get(keys[0]) == 0.
+    cache.put(keys[2], 2.)
+    assert cache.get(keys[1]) is None
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_problems_are_told_apart():
+    cache = FitnessCache()
+    assert cache.key(make_problem(1), 8, b'\x00') != cache.key(make_problem(1), 8, b'\x00')
+
+def test_equal_genomes_share_fitness():
+    problem = make_problem(2)
+    saved_calls = shared_cache.saved_calls
+    genome = Genome.random(100, problem)
+    assert Genome(genome.genes, problem).fitness == genome.fitness
+    assert problem.calls == 1
+    assert shared_cache.saved_calls == saved_calls + 1
@@ -0,0 +1,27 @@
+from random import seed
+from lab9_lib import make_problem
+from src.instrumentation import Tracer, evolve
+from src.population import Population
+
+def test_calls_are_attributed_to_operators():
+    seed(0)
+    problem = make_problem(2)
+    population = Population.initial(50, problem, population_size = 5)
+    with Tracer(problem) as tracer:
+        calls = problem.calls
+        population.next_generation()
+    assert sum(stats.calls for stats in tracer.operators.values()) == problem.calls - calls
+    assert tracer.operators['children/climb_hill'].invocations == 20
+    assert tracer.operators['immigrants/climb_hill'].invocations == 4
+    assert tracer.trace[0]['generation_calls'] == problem.calls - calls
+
+def test_budget_stops_the_run(tmp_path):
+    seed(0)
+    problem = make_problem(2)
+    population = Population.initial(50, problem, population_size = 5)
+    with Tracer(problem, budget = problem.calls + 1000) as tracer:
+        evolve(population, 100)
+    assert 1 <= len(tracer.trace) < 100
+    assert problem.calls < tracer.budget + 10
+    tracer.export(str(tmp_path / 'trace.csv'))
+    assert (tmp_path / 'trace.csv').read_text().startswith('generation,calls')
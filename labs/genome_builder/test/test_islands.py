@@ -0,0 +1,13 @@
+from lab9_lib import make_problem
+from src.islands import Archipelago
+
+def test_islands_migrate_and_report():
+    problem = make_problem(1)
+    with Archipelago(3, 50, problem, population_size = 5, migration_interval = 1, topology = 'complete', seed = 0) as archipelago:
+        stats = archipelago.run(2)
+        populations = archipelago.populations()
+        assert [island.island for island in stats] == [0, 1, 2]
+        assert all(island.generation == 2 for island in stats)
+        assert all(len(population.genomes) == 5 for population in populations)
+        assert archipelago.best_genome.fitness == max(island.best_fitness for island in stats)
+    assert problem.calls > 0
@@ -0,0 +1,15 @@
+from random import seed
+from lab9_lib import make_problem
+from src.parallel import HillClimbPool
+from src.population import Population
+
+def test_parallel_generation_is_reproducible():
+    generations = []
+    for max_workers in (1, 2):
+        seed(0)
+        problem = make_problem(2)
+        with HillClimbPool(max_workers, seed = 42) as pool:
+            population = Population.initial(100, problem, population_size = 6, pool = pool)
+            generations.append([genome.genes for genome in population.next_generation(pool).genomes])
+        assert problem.calls > 0
+    assert generations[0] == generations[1]
@@ -0,0 +1,29 @@
+from random import seed
+from lab9_lib import make_problem
+from src.genome import Genome
+from src.screening import screen_masks
+
+def test_gain_matches_combine_masked():
+    seed(0)
+    problem = make_problem(2)
+    donor = Genome((1,) * 40, problem)
+    pool = [Genome.random(40, problem) for _ in range(10)]
+    masks = [tuple(i < 10 * k for i in range(40)) for k in range(4)]
+    table = screen_masks(donor, masks, pool)
+    assert [entry.mask_index for entry in table] == [3, 2, 1, 0]
+    for entry in table:
+        expected = sum(donor.combine_masked(other, masks[entry.mask_index]).fitness - other.fitness for other in pool) / 10
+        assert abs(entry.gain - expected) < 1e-12
+    assert donor.chromosome_fitness_gain(masks[3], pool) == table[0].gain
+
+def test_worse_masks_are_pruned():
+    seed(0)
+    problem = make_problem(1)
+    donor = Genome((1,) * 100, problem)
+    pool = [Genome.random(100, problem) for _ in range(100)]
+    masks = [tuple(i < 90 for i in range(100)), tuple(False for _ in range(100))]
+    calls = problem.calls
+    table = screen_masks(donor, masks, pool, batch_size = 10)
+    assert table[0].mask_index == 0 and not table[0].pruned
+    assert table[1].pruned and table[1].samples < 100
+    assert problem.calls - calls == 100 + 100 + table[1].samples # baseline, best mask, pruned mask
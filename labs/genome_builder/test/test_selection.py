@@ -0,0 +1,19 @@
+from numpy import array
+from numpy.random import default_rng
+from src.selection import tournament, truncation, rank, roulette
+
+def test_tournament_winner_beats_contendants():
+    fitnesses = array([.1, .5, .3, .9])
+    winners = tournament(fitnesses, 1000, tournament_size = 4, rng = default_rng(0))
+    assert len(winners) == 1000
+    assert (fitnesses[winners] >= .3).mean() > .9
+
+def test_truncation():
+    assert truncation(array([.1, .5, .3]), 4).tolist() == [1, 2, 0, 1]
+
+def test_rank_and_roulette():
+    rng = default_rng(0)
+    ranked = rank(array([.1, .5, .3]), 6000, rng)
+    assert (ranked == 0).sum() < (ranked == 2).sum() < (ranked == 1).sum()
+    assert 2 not in roulette(array([.2, .5, 0.]), 1000, rng)
+    assert len(set(roulette(array([0., 0.]), 100, rng).tolist())) == 2
@@ -0,0 +1,27 @@
+from random import seed
+from numpy.random import default_rng
+from lab9_lib import make_problem
+from src.genome import Genome
+from src.population import Population
+from src.surrogate import LinearSurrogate
+
+def test_surrogate_learns_onemax_ranking():
+    seed(0)
+    problem = make_problem(1)
+    surrogate = LinearSurrogate(50, warmup = 200, rng = default_rng(0))
+    surrogate.screen([Genome.random(50, problem) for _ in range(400)])
+    selected = surrogate.select(candidates := [Genome.random(50, problem) for _ in range(20)])
+    assert len(selected) == 10
+    assert sum(g.fitness for g in selected) / 10 > sum(g.fitness for g in candidates) / 20
+
+def test_surrogate_saves_evaluations():
+    seed(0)
+    problem = make_problem(2)
+    population = Population.initial(60, problem, population_size = 5)
+    surrogate = LinearSurrogate(60, warmup = 20, audit_rate = .5, rng = default_rng(0))
+    calls = problem.calls
+    population = population.next_generation(surrogate = surrogate)
+    assert surrogate.stats.saved_evaluations > 0
+    assert surrogate.stats.audits > 0
+    assert problem.calls - calls == surrogate.stats.evaluated + surrogate.stats.audits + 4 # random immigrants are scored directly
+    assert surrogate.stats.saved_evaluations == surrogate.stats.candidates - (problem.calls - calls - 4)
@@ -0,0 +1,9 @@
+from pytest import fixture
+from src import grundy
+
+@fixture(autouse = True)
+def grundy_cache(tmp_path, monkeypatch):
+    """Grundy tables are computed and persisted per test, never read from or written to the source tree"""
+
+    monkeypatch.setattr(grundy, 'cache_directory', tmp_path / 'grundy_tables')
+    monkeypatch.setattr(grundy, '_tables', dict())
@@ -1,20 +1,22 @@
 from src.state import State
 from src.strategy import Strategy
-from src.game import Game
 from src.generation import Generation
-from itertools import product
+from src.evaluator import FitnessEvaluator
+from src.tournament import Tournament, play_pairing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 
-def confront_strategies(player: Strategy, opponent: Strategy, games_number = 100):
-    wins = 0
-    for player_starts, _ in product([False, True], range(games_number // 2)):
-        game = Game(4, player, opponent, player_starts)
-        try:
-            if game.player_wins():
-                wins += 1
-        except ValueError:
-            pass
-    losses = games_number - wins
-    print(f'{player}: {wins},  {opponent}: {losses}')
+def confront_strategies(player: Strategy, opponent: Strategy, games_number = 100, rows = 4, k: int | None = None):
+    result = play_pairing(player, opponent, rows, k, games_number)
+    lower, upper = result.score.interval()
+    print(f'{player}: {result.victories},  {opponent}: {result.games - result.victories}  '
+          f'(win rate in [{lower:.2f}, {upper:.2f}], forfeits: {result.forfeits})')
+
+def tournament(workers: int | None = None):
+    '''Every registered strategy against every other on 3 to 6 rows, with unlimited moves and with k = 3'''
+    with ProcessPoolExecutor(workers) if workers else nullcontext() as pool:
+        results = Tournament(rows = range(3, 7), ks = (None, 3)).play(pool)
+    print(results)
 
 def one_plus_three():
     initial_state = State()
@@ -35,20 +37,23 @@ def one_plus_three():
         print(f'Fit: {current_fitness}')
     print(current_state)
 
-def evolution_strategy():
-    initial_generation = Generation()
+def evolution_strategy(workers: int | None = None):
+    '''Candidates are evaluated in a pool of {workers} processes, in this process when None'''
     total_generations = 20
 
-    current_generation = initial_generation
-    for i, _ in enumerate(range(total_generations)):
-        current_generation = current_generation.next()
-        fittest = current_generation.fittest_individual()
-        print(f'=== Generation {i} ===')
-        print(f'Fittest individual (fitness = {fittest.fitness()}):')
-        print(current_generation.fittest_individual())
-        print()
+    with ProcessPoolExecutor(workers) if workers else nullcontext() as pool:
+        current_generation = Generation(evaluator = FitnessEvaluator(pool = pool))
+        for i, _ in enumerate(range(total_generations)):
+            current_generation = current_generation.next()
+            fittest = current_generation.fittest_individual()
+            print(f'=== Generation {i} ===')
+            print(f'Fittest individual (fitness = {current_generation.fitness(fittest):.2f}):')
+            print(current_generation.fittest_individual())
+            print()
+    print(f'Games played: {current_generation.evaluator.games_played}')
 
 if __name__ == '__main__':
     # one_plus_three()
     # confront_strategies(Strategy.expert_system(), Strategy.optimal())
+    # tournament()
     evolution_strategy()
\ No newline at end of file
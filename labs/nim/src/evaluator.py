@@ -0,0 +1,115 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from concurrent.futures import Executor
+from itertools import repeat
+from math import sqrt
+from random import getrandbits
+from numpy.random import SeedSequence, default_rng
+from .state import State
+
+@dataclass
+class Score:
+    """Running win rate of a state over all the games it played so far"""
+
+    victories: int = 0
+    games: int = 0
+
+    @property
+    def mean(self) -> float:
+        return self.victories / self.games if self.games else 0.
+
+    def interval(self, z = 2.) -> tuple[float, float]:
+        """Wilson score interval of the win rate, it does not collapse when all the games are won or lost"""
+
+        if not self.games:
+            return 0., 1.
+        n, p = self.games, self.mean
+        center = (p + z * z / (2 * n)) / (1 + z * z / n)
+        half_width = z * sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+        return min(p, center - half_width), max(p, center + half_width) # p is inside, also after rounding
+
+def _victories(state: State, nim_rows: int, games: int, seed: SeedSequence) -> int:
+    return state.victories(nim_rows, games, default_rng(seed))
+
+@dataclass
+class FitnessEvaluator:
+    """Memoized fitness of states: every state keeps the games it already played, so asking for the fitness of
+    the same state again costs nothing and a state that plays more games only gets a more precise score.
+
+    rank selects by racing: each candidate plays {initial_games}, then only the candidates that could still be
+    on either side of the selection boundary play {batch_games} more, until the selection is settled or they
+    reach {max_games}.
+
+    Given a pool (e.g. a ProcessPoolExecutor) the games of a racing round are played across its workers.
+    Every task gets its own seed spawned from {seed}, so results do not depend on the pool or its size"""
+
+    nim_rows: int = 4
+    initial_games: int = 50
+    batch_games: int = 50
+    max_games: int = 800
+    z: float = 2.
+    pool: Executor | None = field(default = None, repr = False)
+    chunksize: int = 4
+    seed: int = field(default_factory = lambda: getrandbits(64))
+    scores: dict[State, Score] = field(default_factory = dict)
+    games_played: int = 0
+    _seed_sequence: SeedSequence = field(init = False, repr = False)
+
+    def __post_init__(self):
+        self._seed_sequence = SeedSequence(self.seed)
+
+    def play(self, requests: list[tuple[State, int]]) -> None:
+        """Plays the requested number of games for every state, in the pool when there is one"""
+
+        states, games = [state for state, _ in requests], [games for _, games in requests]
+        arguments = (states, repeat(self.nim_rows), games, self._seed_sequence.spawn(len(requests)))
+        if self.pool is None:
+            results = map(_victories, *arguments)
+        else:
+            results = self.pool.map(_victories, *arguments, chunksize = self.chunksize)
+        for state, state_games, victories in zip(states, games, results):
+            score = self.scores.setdefault(state, Score())
+            score.victories += victories
+            score.games += state_games
+            self.games_played += state_games
+
+    def sample(self, states: list[State]) -> None:
+        """Brings every state up to {initial_games}"""
+
+        missing = {state: self.initial_games - self.scores.get(state, Score()).games for state in states}
+        self.play([(state, games) for state, games in missing.items() if games > 0])
+
+    def score(self, state: State) -> Score:
+        self.sample([state])
+        return self.scores[state]
+
+    def fitness(self, state: State) -> float:
+        return self.score(state).mean
+
+    def undecided(self, candidates: list[State], selected: int) -> list[State]:
+        """Candidates that may or may not be among the best {selected}: at least {selected} others are not surely
+        worse than them, and fewer than {selected} others are surely better"""
+
+        intervals = {state: self.score(state).interval(self.z) for state in candidates}
+        lowers = sorted((lower for lower, _ in intervals.values()), reverse = True)
+        if len(lowers) <= selected:
+            return []
+        undecided = []
+        for state, (lower, upper) in intervals.items():
+            surely_out = upper < lowers[selected - 1]
+            surely_in = sum(other_upper > lower for _, other_upper in intervals.values()) <= selected
+            if not surely_out and not surely_in:
+                undecided.append(state)
+        return undecided
+
+    def rank(self, candidates: list[State] | tuple[State, ...], selected: int) -> list[State]:
+        """Candidates sorted by descending fitness, sampled enough to tell the best {selected} apart"""
+
+        unique_candidates = list(dict.fromkeys(candidates))
+        self.sample(unique_candidates)
+        while True:
+            racing = [state for state in self.undecided(unique_candidates, selected) if self.scores[state].games < self.max_games]
+            if not racing:
+                break
+            self.play([(state, min(self.batch_games, self.max_games - self.scores[state].games)) for state in racing])
+        return sorted(candidates, key = self.fitness, reverse = True)
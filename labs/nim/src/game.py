@@ -1,12 +1,17 @@
+from __future__ import annotations
 from .nim import Nim
 from .strategy import Strategy
 from .move import Move
 from logging import INFO, info, WARNING, basicConfig
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .trace import TraceRecorder
 
 class Game():
 
-    def __init__(self, initial_rows: int, player: Strategy, opponent: Strategy, play_first: bool):
-        self._nim = Nim(initial_rows)
+    def __init__(self, initial_rows: int, player: Strategy, opponent: Strategy, play_first: bool, k: int | None = None):
+        self._nim = Nim(initial_rows, k)
         self._player = player
         self._opponent = opponent
         self._player_turn = play_first
@@ -14,22 +19,35 @@ class Game():
     def __str__(self):
         return f'\t{self._nim} Turn: {'player' if self._player_turn else 'opponent'} '
 
-    def play_turn(self):
+    def play_turn(self) -> Move:
         active_player = self._player if self._player_turn else self._opponent
         move: Move = active_player.make_move(self._nim)
         self._nim.nimming(move)
         self._player_turn = not self._player_turn
+        return move
 
-    def play(self, logging = False):
+    def play(self, logging = False, recorder: TraceRecorder | None = None):
+        '''Plays until the game is over, every move is appended to the recorder when one is given'''
         if logging:
             basicConfig(level = INFO)
             info(f'\tLogging game {self._player} vs {self._opponent}')
             info(self)
+        if recorder is not None:
+            game, turn, nim_sum = recorder.start_game(len(self._nim.rows), self._nim.k), 0, self._nim.nim_sum()
+            record = recorder.record
         while not self._nim.game_over():
-            self.play_turn()
+            if recorder is not None:
+                player_turn = self._player_turn
+                move = self.play_turn()
+                record(game, turn, move.row, move.quantity, nim_sum, player_turn)
+                left = self._nim.rows[move.row]
+                nim_sum ^= left ^ (left + move.quantity) # only the moved row changed
+                turn += 1
+            else:
+                self.play_turn()
             if logging:
                 info(self)
 
-    def player_wins(self) -> bool:
-        self.play()
+    def player_wins(self, recorder: TraceRecorder | None = None) -> bool:
+        self.play(recorder = recorder)
         return self._player_turn
\ No newline at end of file
@@ -1,6 +1,7 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from src.state import State
+from src.evaluator import FitnessEvaluator
 from random import choices
 
 @dataclass(frozen=True)
@@ -9,6 +10,7 @@ class Generation():
     λ: int = 30
     # this must be sorted in descending fitness
     population: tuple[State, ...] = tuple(State() for _ in range(μ))
+    evaluator: FitnessEvaluator = field(default_factory = FitnessEvaluator, compare = False)
 
     def offspring(self) -> tuple[State, ...]:
         random_parents = choices(self.population, k=self.λ)
@@ -17,11 +19,12 @@ class Generation():
     def next(self) -> Generation:
         offspring = self.offspring()
         candidates: tuple[State, ...] = self.population + offspring
-        ranked_candidates = sorted(candidates, key=lambda state: state.fitness(), reverse=True)
+        ranked_candidates = self.evaluator.rank(candidates, self.μ)
         fittest = tuple(ranked_candidates[:self.μ])
-        return Generation(self.μ, self.λ, fittest)
+        return Generation(self.μ, self.λ, fittest, self.evaluator)
 
     def fittest_individual(self) -> State:
         return self.population[0]
 
-
+    def fitness(self, state: State) -> float:
+        return self.evaluator.fitness(state)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from os import replace, unlink
+from tempfile import NamedTemporaryFile
+from functools import reduce
+from operator import xor
+from numpy import int64, arange, load, savez, zeros
+from numpy.typing import NDArray
+from .move import Move
+
+# where tables are persisted, None to keep them in memory only
+cache_directory: Path | None = Path(__file__).parent.parent / 'grundy_tables'
+
+def mex(values: NDArray[int64]) -> int:
+    """Minimum excluded value"""
+    present, value = set(values.tolist()), 0
+    while value in present:
+        value += 1
+    return value
+
+@dataclass(frozen=True)
+class GrundyTables:
+    """Grundy values of a single row when a move takes from 1 to k objects, for rows of up to size - 1 objects.
+
+    Positions are sums of rows. Under misère play the game is tame: the player to move loses if and only if
+    some row has normal Grundy value >= 2 and their nim sum is 0, or all rows have Grundy value <= 1 and
+    their nim sum is 1. So the normal values, plus a lookup table of the move reaching each value, serve
+    the winning moves of any position in O(rows)"""
+
+    k: int
+    normal: NDArray[int64] # normal[n]: Grundy value of a row of n objects, who takes the last object wins
+    misere: NDArray[int64] # misere[n]: the same when who takes the last object loses
+    moves: NDArray[int64] # moves[n, g]: objects to take from a row of n to leave normal Grundy value g, 0 if impossible
+
+    @property
+    def size(self) -> int:
+        return len(self.normal)
+
+    @staticmethod
+    def compute(k: int, size: int) -> GrundyTables:
+        normal, misere = zeros(size, dtype = int64), zeros(size, dtype = int64)
+        misere[0] = 1
+        for n in range(1, size):
+            normal[n] = mex(normal[max(0, n - k):n])
+            misere[n] = mex(misere[max(0, n - k):n])
+        moves = zeros((size, int(normal.max()) + 1), dtype = int64)
+        for taken in range(min(k, size - 1), 0, -1): # the smallest move reaching a value is the one kept
+            moves[arange(taken, size), normal[:size - taken]] = taken
+        return GrundyTables(k, normal, misere, moves)
+
+    def save(self, path: Path) -> None:
+        """Written to a temporary file of its own then renamed, so concurrent writers of the same table never
+        interleave their writes and readers only ever see a complete file"""
+
+        with NamedTemporaryFile(dir = path.parent, prefix = f'{path.stem}.', suffix = '.tmp.npz', delete = False) as file:
+            try:
+                savez(file, normal = self.normal, misere = self.misere, moves = self.moves)
+            except BaseException:
+                unlink(file.name)
+                raise
+        replace(file.name, path)
+
+    @staticmethod
+    def load(k: int, path: Path) -> GrundyTables:
+        with load(path) as tables:
+            return GrundyTables(k, tables['normal'], tables['misere'], tables['moves'])
+
+    def losing(self, rows: tuple[int, ...]) -> bool:
+        """Misère: whether the player to move loses against perfect play"""
+
+        grundy = [int(self.normal[row]) for row in rows]
+        nim_sum = reduce(xor, grundy, 0)
+        return nim_sum == 0 if max(grundy, default = 0) >= 2 else nim_sum == 1
+
+    def winning_moves(self, rows: tuple[int, ...]) -> list[Move]:
+        """Misère: moves leaving the opponent in a losing position, a table lookup per row"""
+
+        grundy = [int(self.normal[row]) for row in rows]
+        nim_sum = reduce(xor, grundy, 0)
+        large_count = sum(1 for value in grundy if value >= 2)
+        moves = []
+        for index, (row, value) in enumerate(zip(rows, grundy)):
+            if large_count - (value >= 2):
+                target = nim_sum ^ value
+            else:
+                target = 1 ^ nim_sum ^ value
+            if target < self.moves.shape[1] and self.moves[row, target]:
+                moves.append(Move(index, int(self.moves[row, target])))
+        return moves
+
+_tables: dict[int, GrundyTables] = dict()
+
+def tables(k: int, size: int) -> GrundyTables:
+    """Tables for k covering rows of up to size - 1 objects: from memory, else from disk, else computed and saved.
+    Tables grow by doubling, so a game with longer rows does not recompute them every turn"""
+
+    cached = _tables.get(k)
+    if cached is not None and cached.size >= size:
+        return cached
+    path = cache_directory / f'k{k}.npz' if cache_directory is not None else None
+    if path is not None and path.exists():
+        cached = GrundyTables.load(k, path)
+    if cached is None or cached.size < size:
+        cached = GrundyTables.compute(k, max(size, 2 * cached.size if cached is not None else 64))
+        if path is not None:
+            path.parent.mkdir(parents = True, exist_ok = True)
+            cached.save(path)
+    _tables[k] = cached
+    return cached
@@ -15,9 +15,9 @@ def nim_sum_original(game_state: Nim) -> int:
 
 class Nim:
     @staticmethod
-    def from_rows(rows: list[int]):
+    def from_rows(rows: list[int], k: int | None = None):
         num_rows = len(rows)
-        nim = Nim(num_rows)
+        nim = Nim(num_rows, k)
         nim._rows = [row for row in rows]
         return nim
 
@@ -35,6 +35,11 @@ class Nim:
     def rows(self) -> tuple:
         return tuple(self._rows)
 
+    @property
+    def k(self) -> int | None:
+        """Maximum number of objects a move can take, None when unlimited"""
+        return self._k
+
     def nimming(self, ply: Move) -> None:
         row, num_objects = ply.row, ply.quantity
         assert self._rows[row] >= num_objects
@@ -0,0 +1,144 @@
+from __future__ import annotations
+from typing import Callable, Sequence, TYPE_CHECKING
+from numpy import bool_, int64, arange, argmax, asarray, bitwise_xor, cumsum, empty, floor, minimum, tile, unique, where
+from numpy.random import Generator, default_rng
+from numpy.typing import NDArray
+from .strategy import Strategy
+from .grundy import tables
+
+if TYPE_CHECKING:
+    from .trace import TraceRecorder
+
+Rows = NDArray[int64] # one game per row, one nim row per column
+# a move maker gets the boards to move on, the random generator and the k of the game
+BatchMoveMaker = Callable[[Rows, Generator, int | None], tuple[NDArray[int64], NDArray[int64]]]
+
+def _first(condition: NDArray[bool_]) -> NDArray[int64]:
+    return argmax(condition, axis = 1)
+
+def _take(rows: Rows, columns: NDArray[int64]) -> NDArray[int64]:
+    return rows[arange(len(rows)), columns]
+
+def _max_quantities(rows: Rows, k: int | None) -> Rows:
+    return rows if k is None else minimum(rows, k)
+
+def _random_move(rows: Rows, rng: Generator, k: int | None) -> tuple[NDArray[int64], NDArray[int64]]:
+    """random_move: every possible move equally likely"""
+
+    ends = cumsum(_max_quantities(rows, k), axis = 1)
+    moves = floor(rng.random(len(rows)) * ends[:, -1]).astype(int64)
+    row = (ends <= moves[:, None]).sum(axis = 1)
+    return row, moves - (_take(ends, row) - _take(_max_quantities(rows, k), row)) + 1
+
+def _winning_quantities(rows: Rows, k: int | None) -> Rows:
+    """Objects to take from each row for a winning move (see winning_moves), 0 where there is none"""
+
+    if k is not None:
+        grundy_tables = tables(k, int(rows.max()) + 1)
+        grundy = grundy_tables.normal[rows]
+        nim_sum = bitwise_xor.reduce(grundy, axis = 1)[:, None]
+        large_rows = grundy >= 2
+        other_large_rows = large_rows.sum(axis = 1)[:, None] - large_rows
+        target = where(other_large_rows > 0, nim_sum ^ grundy, 1 ^ nim_sum ^ grundy)
+        reachable = target < grundy_tables.moves.shape[1]
+        return where(reachable, grundy_tables.moves[rows, where(reachable, target, 0)], 0)
+    nim_sum = bitwise_xor.reduce(rows, axis = 1)[:, None]
+    long_rows, unitary_rows = rows > 1, rows == 1
+    other_long_rows = long_rows.sum(axis = 1)[:, None] - long_rows
+    other_unitary_rows = unitary_rows.sum(axis = 1)[:, None] - unitary_rows
+    left = where(other_long_rows > 0, nim_sum ^ rows, 1 - other_unitary_rows % 2)
+    return where(left < rows, rows - left, 0)
+
+def random_moves(rows: Rows, rng: Generator, k: int | None = None) -> tuple[NDArray[int64], NDArray[int64]]:
+    """pure_random: a random non empty row, then a random quantity"""
+
+    row = argmax(rng.random(rows.shape) * (rows > 0), axis = 1)
+    quantity = floor(rng.random(len(rows)) * _take(_max_quantities(rows, k), row)).astype(int64) + 1
+    return row, quantity
+
+def gabriele_moves(rows: Rows, rng: Generator, k: int | None = None) -> tuple[NDArray[int64], NDArray[int64]]:
+    """gabriele: as many objects as possible from the lowest non empty row"""
+
+    row = _first(rows > 0)
+    return row, _take(_max_quantities(rows, k), row)
+
+def optimal_moves(rows: Rows, rng: Generator, k: int | None = None) -> tuple[NDArray[int64], NDArray[int64]]:
+    """optimal: a random winning move, a random move when there is none"""
+
+    quantities = _winning_quantities(rows, k)
+    row = argmax(rng.random(rows.shape) * (quantities > 0), axis = 1)
+    quantity = _take(quantities, row)
+    losing = quantity == 0
+    if losing.any():
+        row[losing], quantity[losing] = _random_move(rows[losing], rng, k)
+    return row, quantity
+
+def expert_system_moves(rows: Rows, rng: Generator, k: int | None = None) -> tuple[NDArray[int64], NDArray[int64]]:
+    """expert_system, its rules are applied in the same order"""
+
+    if k is not None:
+        quantities = _winning_quantities(rows, k)
+        winning_row = _first(quantities > 0)
+        longest_row = _first(rows == rows.max(axis = 1)[:, None])
+        winning = _take(quantities, winning_row) > 0
+        return where(winning, winning_row, longest_row), where(winning, _take(quantities, winning_row), 1)
+    nim_sum = bitwise_xor.reduce(rows, axis = 1)
+    remaining_rows, unitary_rows = (rows > 0).sum(axis = 1), (rows == 1).sum(axis = 1)
+    longest_row = _first(rows == rows.max(axis = 1)[:, None])
+    longest_row_size = _take(rows, longest_row)
+    unstable_row = _first(rows ^ nim_sum[:, None] < rows)
+    row = where(nim_sum == 0, longest_row, unstable_row)
+    quantity = where(nim_sum == 0, 1, _take(rows - (rows ^ nim_sum[:, None]), unstable_row))
+    one_long_row = remaining_rows - unitary_rows == 1
+    row = where(one_long_row, longest_row, row)
+    quantity = where(one_long_row, longest_row_size - (unitary_rows + 1) % 2, quantity)
+    only_unitary_rows = remaining_rows == unitary_rows
+    row = where(only_unitary_rows, _first(rows == 1), row)
+    quantity = where(only_unitary_rows, 1, quantity)
+    return row, quantity
+
+BATCH_MOVE_MAKERS: dict[str, BatchMoveMaker] = {
+    Strategy.random().name: random_moves,
+    Strategy.gabriele().name: gabriele_moves,
+    Strategy.optimal().name: optimal_moves,
+    Strategy.expert_system().name: expert_system_moves,
+}
+
+def batch_move_maker(strategy: Strategy) -> BatchMoveMaker:
+    if strategy.name not in BATCH_MOVE_MAKERS:
+        raise ValueError(f'Strategy {strategy} cannot be simulated in batch')
+    return BATCH_MOVE_MAKERS[strategy.name]
+
+def play_games(initial_rows: int, strategies: Sequence[Strategy], player: Sequence[int], opponent: Sequence[int],
+               play_first: Sequence[bool], rng: Generator | None = None, k: int | None = None,
+               recorder: TraceRecorder | None = None) -> NDArray[bool_]:
+    """Plays many independent games at once, game i pits strategies[player[i]] against strategies[opponent[i]]
+    on a Nim(initial_rows, k) board. Returns whether the player won each game, as Game.player_wins would.
+
+    Every turn advances all the unfinished games together: games are grouped by the strategy that has to move
+    and every group gets its moves from one vectorized call. The moves of every turn are appended to the
+    recorder, when one is given, in one call"""
+
+    rng = rng or default_rng()
+    move_makers = [batch_move_maker(strategy) for strategy in strategies]
+    player, opponent = asarray(player, dtype = int64), asarray(opponent, dtype = int64)
+    player_turn = asarray(play_first, dtype = bool).copy()
+    rows = tile(arange(initial_rows, dtype = int64) * 2 + 1, (len(player), 1))
+    active, turn_number = arange(len(player)), 0
+    if recorder is not None:
+        game_ids = recorder.start_games(len(player), initial_rows, k)
+    while active.size:
+        board, turn = rows[active], player_turn[active]
+        strategy = where(turn, player[active], opponent[active])
+        row, quantity = empty(len(active), dtype = int64), empty(len(active), dtype = int64)
+        for index in unique(strategy):
+            selected = strategy == index
+            row[selected], quantity[selected] = move_makers[index](board[selected], rng, k)
+        assert (quantity > 0).all() and (quantity <= _take(_max_quantities(board, k), row)).all()
+        if recorder is not None:
+            recorder.record_many(game_ids[active], turn_number, row, quantity, bitwise_xor.reduce(board, axis = 1), turn)
+        rows[active, row] -= quantity
+        turn_number += 1
+        player_turn[active] = ~turn
+        active = active[rows[active].any(axis = 1)]
+    return player_turn
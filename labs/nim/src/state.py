@@ -1,10 +1,10 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from .strategy import Strategy
-from .game import Game
-from random import randint
-from numpy.random import choice
-from itertools import product
+from .simulator import play_games
+from random import randint, getrandbits
+from numpy import arange
+from numpy.random import Generator, choice, default_rng
 
 available_strategies: list[Strategy] = Strategy.all()
 strategies_count = len(available_strategies)
@@ -36,17 +36,20 @@ class State():
     def crossover(first_parent: State, second_parent: State) -> State:
         raise NotImplementedError()
 
-    def fitness(self, nim_rows = 4):
-        num_games = 100
+    def fitness(self, nim_rows = 4, num_games = 100):
+        """Win rate against gabriele, playing first in half of the games"""
+        return self.victories(nim_rows, num_games) / num_games
+
+    def victories(self, nim_rows = 4, num_games = 100, rng: Generator | None = None) -> int:
+        """Games won against gabriele, playing first in half of them. Every game draws its strategy from
+        the state and all the games are simulated in one batch"""
+
+        rng = rng or default_rng(getrandbits(64))
         opponent = Strategy.gabriele()
-        victories, total_games = 0, 0
-        for play_first, game_number in product([True, False], range(1, num_games // 2 + 1)):
-            player = self.pick_strategy()
-            game = Game(nim_rows, player, opponent, play_first)
-            if game.player_wins():
-                victories += 1
-            total_games += 1
-        return victories / total_games
+        players = rng.choice(len(self.strategies), size = num_games, p = self.strategy_probability)
+        play_first = arange(num_games) < num_games // 2
+        wins = play_games(nim_rows, self.strategies + (opponent,), players, [len(self.strategies)] * num_games, play_first, rng)
+        return int(wins.sum())
 
     def __str__(self) -> str:
         ret = '\n'
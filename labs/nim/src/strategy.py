@@ -1,41 +1,81 @@
 from __future__ import annotations
 from .move import Move
 from .nim import Nim
+from .grundy import tables
 from dataclasses import dataclass
 from typing import Callable
 from random import choice, randint
-from copy import deepcopy
+from functools import reduce
+from operator import xor
 
-def analize(raw: Nim) -> dict:
-    cooked = dict()
-    cooked["possible_moves"] = dict()
-    for ply in (Move(r, o) for r, c in enumerate(raw.rows) for o in range(1, c + 1)):
-        tmp: Nim = deepcopy(raw)
-        tmp.nimming(ply)
-        cooked["possible_moves"][ply] = tmp.nim_sum()
-    return cooked
+def winning_moves(game_state: Nim) -> list[Move]:
+    """Moves leaving the opponent in a losing position, in O(rows) and without copying the board.
+    Who takes the last object loses (misère): while some row would keep more than one object the move must
+    leave nim sum 0, otherwise it must leave an odd number of rows with one object.
+    When moves are limited to k objects the Grundy tables of k take the place of the row sizes"""
+
+    rows = game_state.rows
+    if game_state.k is not None:
+        return tables(game_state.k, max(rows) + 1).winning_moves(rows)
+    nim_sum = reduce(xor, rows, 0)
+    long_rows_count = sum(1 for row in rows if row > 1)
+    unitary_rows_count = rows.count(1)
+    moves = []
+    for index, row in enumerate(rows):
+        if row == 0:
+            continue
+        if long_rows_count - (row > 1):
+            left = nim_sum ^ row
+        else:
+            left = 1 - (unitary_rows_count - (row == 1)) % 2
+        if left < row:
+            moves.append(Move(index, row - left))
+    return moves
+
+def max_quantities(game_state: Nim) -> list[int]:
+    """Most objects a move can take from each row"""
+    if game_state.k is None:
+        return list(game_state.rows)
+    return [min(row, game_state.k) for row in game_state.rows]
+
+def random_move(game_state: Nim) -> Move:
+    """A move drawn uniformly among all the possible ones, in O(rows)"""
+
+    quantities = max_quantities(game_state)
+    move = randint(0, sum(quantities) - 1)
+    for index, quantity in enumerate(quantities):
+        if move < quantity:
+            return Move(index, move + 1)
+        move -= quantity
+    raise ValueError('Game is over')
 
 def optimal(game_state: Nim) -> Move:
-    analysis = analize(game_state)
-    # logging.debug(f"analysis:\n{pformat(analysis)}")
-    spicy_moves = [ply for ply, ns in analysis["possible_moves"].items() if ns != 0]
-    if not spicy_moves:
-        spicy_moves = list(analysis["possible_moves"].keys())
-    ply = choice(spicy_moves)
-    return ply
+    """A random winning move, a random move if there is none"""
+
+    moves = winning_moves(game_state)
+    if not moves:
+        return random_move(game_state)
+    return choice(moves)
 
 def pure_random(game_state: Nim) -> Move:
     """A completely random move"""
     row = choice([r for r, c in enumerate(game_state.rows) if c > 0])
-    num_objects = randint(1, game_state.rows[row])
+    num_objects = randint(1, max_quantities(game_state)[row])
     return Move(row, num_objects)
 
 def gabriele(game_state: Nim) -> Move:
     """Pick always the maximum possible number of the lowest row"""
-    possible_moves = [(r, o) for r, c in enumerate(game_state.rows) for o in range(1, c + 1)]
+    possible_moves = [(r, o) for r, c in enumerate(max_quantities(game_state)) for o in range(1, c + 1)]
     return Move(*max(possible_moves, key=lambda m: (-m[0], m[1])))
 
 def expert_system(state: Nim) -> Move:
+    if state.k is not None:
+        # the rules below assume unlimited moves: take the first winning move, else a minimal move
+        moves = winning_moves(state)
+        if moves:
+            return moves[0]
+        longest_row = max(state.rows)
+        return Move(state.rows.index(longest_row), 1)
     nim_sum = state.nim_sum()
     stable_state = nim_sum == 0
     remaining_rows = [row for row in state.rows if row > 0]
@@ -88,4 +128,33 @@ class Strategy():
 
     @staticmethod
     def all() -> list[Strategy]:
-        return [Strategy.random(), Strategy.gabriele(), Strategy.optimal(), Strategy.expert_system()]
\ No newline at end of file
+        return [Strategy.random(), Strategy.gabriele(), Strategy.optimal(), Strategy.expert_system()]
+
+    @staticmethod
+    def register(strategy: Strategy) -> Strategy:
+        """Makes the strategy available by name. Registered strategies are pickled as their name, so a worker
+        process must register them too (forked workers inherit the registry)"""
+        if strategy.name in registry and registry[strategy.name] != strategy:
+            raise ValueError(f'Strategy {strategy.name} already registered')
+        registry[strategy.name] = strategy
+        return strategy
+
+    @staticmethod
+    def by_name(name: str) -> Strategy:
+        if name not in registry:
+            raise ValueError(f'Unknown strategy {name}')
+        return registry[name]
+
+    @staticmethod
+    def registered() -> list[Strategy]:
+        return list(registry.values())
+
+    def __reduce__(self):
+        # registered strategies are pickled by name, the move maker is never serialized
+        if registry.get(self.name) == self:
+            return Strategy.by_name, (self.name,)
+        return Strategy, (self.name, self.move_maker)
+
+registry: dict[str, Strategy] = dict()
+for built_in in Strategy.all():
+    Strategy.register(built_in)
@@ -0,0 +1,162 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Callable, Sequence
+from concurrent.futures import Executor
+from itertools import product, repeat
+from random import seed as seed_random, getrandbits
+from time import perf_counter
+from numpy import full, nan
+from numpy.random import SeedSequence
+from numpy.typing import NDArray
+from .strategy import Strategy
+from .nim import Nim
+from .move import Move
+from .evaluator import Score
+
+@dataclass
+class Timed:
+    """Move maker counting its moves and the time spent making them"""
+
+    move_maker: Callable[[Nim], Move]
+    moves: int = 0
+    seconds: float = 0.
+
+    def __call__(self, game_state: Nim) -> Move:
+        start = perf_counter()
+        move = self.move_maker(game_state)
+        self.seconds += perf_counter() - start
+        self.moves += 1
+        return move
+
+@dataclass(frozen=True)
+class PairingResult:
+    player: str
+    opponent: str
+    rows: int
+    k: int | None
+    games: int
+    victories: int
+    forfeits: int # games lost by the player making an illegal move or failing to move
+    seconds: float # wall time of all the games
+    player_moves: int
+    player_seconds: float
+    opponent_moves: int
+    opponent_seconds: float
+
+    @property
+    def score(self) -> Score:
+        return Score(self.victories, self.games)
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.seconds if self.seconds else 0.
+
+def _checked(nim: Nim, move: Move) -> Move:
+    """The move, ValueError if it cannot be played on nim"""
+
+    if not 0 <= move.row < len(nim.rows) or not 0 < move.quantity <= nim.rows[move.row] \
+            or (nim.k is not None and move.quantity > nim.k):
+        raise ValueError(f'Illegal move {move} on rows {nim.rows} with k = {nim.k}')
+    return move
+
+def play_pairing(player: Strategy, opponent: Strategy, rows: int, k: int | None = None, games = 100,
+                 seed: int | None = None) -> PairingResult:
+    """Plays {games} games, the player moves first in half of them. A strategy raising ValueError or making an
+    illegal move forfeits the game. Seeds the random module when seed is given"""
+
+    if seed is not None:
+        seed_random(seed)
+    timed_player, timed_opponent = Timed(player.move_maker), Timed(opponent.move_maker)
+    victories, forfeits, start = 0, 0, perf_counter()
+    for game in range(games):
+        nim, player_turn = Nim(rows, k), game < games // 2
+        while not nim.game_over():
+            try:
+                nim.nimming(_checked(nim, (timed_player if player_turn else timed_opponent)(nim)))
+            except ValueError:
+                forfeits += player_turn
+                player_turn = not player_turn # the other side wins
+                break
+            player_turn = not player_turn
+        victories += player_turn
+    return PairingResult(player.name, opponent.name, rows, k, games, victories, forfeits, perf_counter() - start,
+                         timed_player.moves, timed_player.seconds, timed_opponent.moves, timed_opponent.seconds)
+
+def _play_pairing(player: str, opponent: str, rows: int, k: int | None, games: int, seed: SeedSequence) -> PairingResult:
+    return play_pairing(Strategy.by_name(player), Strategy.by_name(opponent), rows, k, games, int(seed.generate_state(1)[0]))
+
+_ANY = object() # matches every number of rows or k, None being a valid k
+
+@dataclass
+class Tournament:
+    """Round robin: every ordered pairing of registered strategies plays {games} games for every number of rows
+    and every k of the grid. Pairings are played in the pool when one is given (strategies travel by name),
+    every pairing is seeded from {seed} so results do not depend on the pool"""
+
+    strategies: Sequence[Strategy] = field(default_factory = Strategy.registered)
+    rows: Sequence[int] = (4,)
+    ks: Sequence[int | None] = (None,)
+    games: int = 100
+    seed: int = field(default_factory = lambda: getrandbits(64))
+    results: list[PairingResult] = field(default_factory = list)
+
+    @property
+    def names(self) -> list[str]:
+        return [strategy.name for strategy in self.strategies]
+
+    def play(self, pool: Executor | None = None) -> Tournament:
+        pairings = list(product(self.names, self.names, self.rows, self.ks))
+        players, opponents, rows, ks = zip(*pairings)
+        arguments = (players, opponents, rows, ks, repeat(self.games), SeedSequence(self.seed).spawn(len(pairings)))
+        results = map(_play_pairing, *arguments) if pool is None else pool.map(_play_pairing, *arguments)
+        self.results = list(results)
+        return self
+
+    def selected(self, rows: int | object = _ANY, k: int | None | object = _ANY) -> list[PairingResult]:
+        """Results with the given number of rows and k, any when omitted: k = None selects unlimited moves"""
+        return [result for result in self.results if rows in (_ANY, result.rows) and k in (_ANY, result.k)]
+
+    def win_rates(self, rows: int | object = _ANY, k: int | None | object = _ANY, z = 2.) -> tuple[NDArray, NDArray, NDArray]:
+        """Win rate of row strategy against column strategy with its confidence interval (lower and upper
+        bound matrices), over the selected configurations"""
+
+        index = {name: i for i, name in enumerate(self.names)}
+        scores: dict[tuple[int, int], Score] = dict()
+        for result in self.selected(rows, k):
+            score = scores.setdefault((index[result.player], index[result.opponent]), Score())
+            score.victories += result.victories
+            score.games += result.games
+        rates, lowers, uppers = (full((len(index), len(index)), nan) for _ in range(3))
+        for (i, j), score in scores.items():
+            rates[i, j] = score.mean
+            lowers[i, j], uppers[i, j] = score.interval(z)
+        return rates, lowers, uppers
+
+    def speed(self) -> dict[str, tuple[float, float]]:
+        """Games per second of the pairings involving each strategy and its mean move latency in seconds"""
+
+        speed = dict()
+        for name in self.names:
+            games, seconds, moves, move_seconds = 0, 0., 0, 0.
+            for result in self.results:
+                if name not in (result.player, result.opponent):
+                    continue
+                games, seconds = games + result.games, seconds + result.seconds
+                if result.player == name:
+                    moves, move_seconds = moves + result.player_moves, move_seconds + result.player_seconds
+                if result.opponent == name:
+                    moves, move_seconds = moves + result.opponent_moves, move_seconds + result.opponent_seconds
+            speed[name] = (games / seconds if seconds else 0., move_seconds / moves if moves else 0.)
+        return speed
+
+    def __str__(self) -> str:
+        rates, lowers, uppers = self.win_rates()
+        lines = [f'{"":<16}' + ''.join(f'{name:>20}' for name in self.names)]
+        for i, name in enumerate(self.names):
+            cells = (f'{rates[i, j]:.2f} [{lowers[i, j]:.2f}, {uppers[i, j]:.2f}]' for j in range(len(self.names)))
+            lines.append(f'{name:<16}' + ''.join(f'{cell:>20}' for cell in cells))
+        lines.append('')
+        lines.append(f'{"":<16}{"games/s":>12}{"move µs":>12}')
+        for name, (games_per_second, latency) in self.speed().items():
+            lines.append(f'{name:<16}{games_per_second:>12.0f}{latency * 1e6:>12.1f}')
+        return '\n'.join(lines)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from pathlib import Path
+from numpy import bool_, int32, int64, arange, argsort, array, concatenate, diff, empty, full, load, savez, searchsorted
+from numpy.typing import NDArray
+from .nim import Nim
+from .move import Move
+
+# one entry per move: the game, the turn within the game, the move, the nim sum before the move
+# and whether the player (not the opponent) moved
+COLUMNS = {'game': int64, 'turn': int32, 'row': int32, 'quantity': int32, 'nim_sum': int64, 'player': bool_}
+# one entry per game: its id, its initial number of rows and its k (-1 when moves are unlimited)
+GAME_COLUMNS = {'id': int64, 'rows': int32, 'k': int32}
+
+@dataclass
+class Trace:
+    """Moves of recorded games, column by column, and the games they belong to"""
+
+    columns: dict[str, NDArray]
+    games: dict[str, NDArray]
+    _order: NDArray[int64] | None = field(default = None, repr = False)
+
+    def __len__(self) -> int:
+        return len(self.columns['game'])
+
+    @staticmethod
+    def concatenate(traces: list[Trace]) -> Trace:
+        return Trace({name: concatenate([trace.columns[name] for trace in traces]) for name in COLUMNS},
+                     {name: concatenate([trace.games[name] for trace in traces]) for name in GAME_COLUMNS})
+
+    @staticmethod
+    def load(path: str | Path) -> Trace:
+        """All the chunks flushed in directory path, in order. Game ids must be unique and sorted, as a single
+        recorder writes them: games are looked up by binary search"""
+
+        chunks = []
+        for chunk in sorted(Path(path).glob('trace_*.npz')):
+            with load(chunk) as arrays:
+                chunks.append(Trace({name: arrays[name] for name in COLUMNS}, {name: arrays[f'game_{name}'] for name in GAME_COLUMNS}))
+        trace = Trace.concatenate(chunks) if chunks else Trace.concatenate([empty_trace()])
+        if (diff(trace.games['id']) <= 0).any():
+            raise ValueError(f'Game ids in {path} are not unique and sorted, chunks of different recordings?')
+        return trace
+
+    def game(self, game: int) -> dict[str, NDArray]:
+        """Columns of the moves of one game, in turn order"""
+
+        if self._order is None:
+            self._order = argsort(self.columns['game'], kind = 'stable')
+        games = self.columns['game'][self._order]
+        selected = self._order[searchsorted(games, game, 'left'):searchsorted(games, game, 'right')]
+        return {name: column[selected] for name, column in self.columns.items()}
+
+    def moves(self, game: int) -> list[Move]:
+        columns = self.game(game)
+        return [Move(int(row), int(quantity)) for row, quantity in zip(columns['row'], columns['quantity'])]
+
+    def replay(self, game: int) -> list[tuple[int, ...]]:
+        """Positions of a game from the initial one to the last, every move is checked again by Nim"""
+
+        index = int(searchsorted(self.games['id'], game))
+        if index == len(self.games['id']) or self.games['id'][index] != game:
+            raise ValueError(f'Game {game} not recorded')
+        k = int(self.games['k'][index])
+        nim = Nim(int(self.games['rows'][index]), None if k < 0 else k)
+        positions = [nim.rows]
+        for move in self.moves(game):
+            nim.nimming(move)
+            positions.append(nim.rows)
+        return positions
+
+def empty_trace() -> Trace:
+    return Trace({name: empty(0, dtype) for name, dtype in COLUMNS.items()}, {name: empty(0, dtype) for name, dtype in GAME_COLUMNS.items()})
+
+@dataclass
+class TraceRecorder:
+    """Buffers moves and flushes them in bulk, as columns, to directory {path} (trace_00000.npz, ...) whenever
+    {capacity} moves are buffered and on close. Without a path flushed moves are kept in memory.
+    Moves recorded one at a time (Game.play) are buffered as tuples, moves of many games at once (play_games)
+    as the columns they come in, both are converted to columns on flush"""
+
+    path: str | Path | None = None
+    capacity: int = 1 << 16
+    games_started: int = 0
+    chunks_written: int = 0
+    _slots: list[tuple | None] = field(init = False, repr = False)
+    _used_slots: int = field(default = 0, init = False, repr = False)
+    _batches: list[tuple[NDArray, ...]] = field(default_factory = list, init = False, repr = False)
+    _size: int = field(default = 0, init = False, repr = False)
+    _games: dict[str, list[int]] = field(init = False, repr = False)
+    _kept: list[Trace] = field(default_factory = list, init = False, repr = False)
+
+    def __post_init__(self):
+        self._slots = [None] * self.capacity
+        self._games = {name: [] for name in GAME_COLUMNS}
+        if self.path is not None:
+            Path(self.path).mkdir(parents = True, exist_ok = True)
+            if any(Path(self.path).glob('trace_*.npz')):
+                raise ValueError(f'{self.path} already holds a trace, chunks of two recordings would be mixed')
+
+    def __enter__(self) -> TraceRecorder:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def start_game(self, rows: int, k: int | None = None) -> int:
+        game = self.games_started
+        self.games_started += 1
+        self._games['id'].append(game)
+        self._games['rows'].append(rows)
+        self._games['k'].append(-1 if k is None else k)
+        return game
+
+    def start_games(self, games: int, rows: int, k: int | None = None) -> NDArray[int64]:
+        """Ids of {games} new games starting from Nim(rows, k)"""
+
+        ids = arange(self.games_started, self.games_started + games, dtype = int64)
+        self.games_started += games
+        self._games['id'].extend(ids.tolist())
+        self._games['rows'].extend([rows] * games)
+        self._games['k'].extend([-1 if k is None else k] * games)
+        return ids
+
+    def record(self, game: int, turn: int, row: int, quantity: int, nim_sum: int, player: bool) -> None:
+        if self._size >= self.capacity:
+            self.flush()
+        self._slots[self._used_slots] = (game, turn, row, quantity, nim_sum, player)
+        self._used_slots += 1
+        self._size += 1
+
+    def record_many(self, game: NDArray, turn: int, row: NDArray, quantity: NDArray, nim_sum: NDArray, player: NDArray) -> None:
+        """One move for each of many games, as played by the batch simulator"""
+
+        if self._size + len(game) > self.capacity:
+            self.flush()
+        self._batches.append((game, full(len(game), turn), row, quantity, nim_sum, player))
+        self._size += len(game)
+
+    def _buffered(self) -> Trace:
+        parts = self._batches[:]
+        if self._used_slots:
+            parts.append(tuple(array(self._slots[:self._used_slots], dtype = int64).T))
+        columns = {name: concatenate([part[i] for part in parts]).astype(dtype) if parts else empty(0, dtype)
+                   for i, (name, dtype) in enumerate(COLUMNS.items())}
+        games = {name: array(self._games[name], dtype = GAME_COLUMNS[name]) for name in GAME_COLUMNS}
+        return Trace(columns, games)
+
+    def flush(self) -> None:
+        """Writes (or keeps) the buffered moves and the games started since the last flush"""
+
+        if not self._size and not self._games['id']:
+            return
+        trace = self._buffered()
+        if self.path is None:
+            self._kept.append(trace)
+        else:
+            arrays = trace.columns | {f'game_{name}': column for name, column in trace.games.items()}
+            savez(Path(self.path) / f'trace_{self.chunks_written:05}.npz', **arrays)
+        self.chunks_written += 1
+        self._batches, self._used_slots, self._size = [], 0, 0
+        self._games = {name: [] for name in GAME_COLUMNS}
+
+    def close(self) -> None:
+        self.flush()
+
+    def trace(self) -> Trace:
+        """Everything recorded so far"""
+
+        self.flush()
+        return Trace.load(self.path) if self.path is not None else Trace.concatenate(self._kept + [empty_trace()])
@@ -0,0 +1,9 @@
+from functools import cache
+
+@cache
+def losing_position(rows: tuple[int, ...], k: int | None = None) -> bool:
+    '''Brute force misère Nim, where a move takes at most k objects: the player to move loses'''
+    if sum(rows) == 0:
+        return False # the opponent took the last object
+    return all(not losing_position(rows[:r] + (c - o,) + rows[r + 1:], k)
+               for r, c in enumerate(rows) for o in range(1, (c if k is None else min(c, k)) + 1))
@@ -0,0 +1,61 @@
+from src.evaluator import FitnessEvaluator, Score
+from src.state import State
+from src.generation import Generation
+from src.strategy import Strategy, registry
+from src.move import Move
+from pickle import dumps, loads
+from concurrent.futures import ProcessPoolExecutor
+
+expert = State((0., 0., 0., 1.))
+gabriele = State((0., 1., 0., 0.))
+random = State((1., 0., 0., 0.))
+
+def test_score_interval():
+    assert Score().interval() == (0., 1.)
+    lower, upper = Score(50, 50).interval()
+    assert 0.9 < lower < upper == 1.
+    lower, upper = Score(50, 100).interval()
+    assert lower < 0.5 < upper and abs(0.5 - lower - (upper - 0.5)) < 1e-12
+    assert Score(500, 1000).interval()[1] - Score(500, 1000).interval()[0] < upper - lower
+
+def test_fitness_is_memoized():
+    evaluator = FitnessEvaluator(initial_games = 20)
+    fitness = evaluator.fitness(random)
+    assert evaluator.fitness(random) == fitness
+    assert evaluator.games_played == 20
+
+def test_racing_stops_dominated_candidates():
+    evaluator = FitnessEvaluator(initial_games = 40, batch_games = 40, max_games = 400, seed = 0)
+    ranked = evaluator.rank([random, gabriele, expert, random], 1)
+    assert ranked[0] == expert
+    assert ranked.count(random) == 2
+    assert evaluator.scores[random].games == 40
+    assert evaluator.games_played < 3 * evaluator.max_games
+
+def test_generation_reuses_scores():
+    generation = Generation(2, 3, (expert, random))
+    next_generation = generation.next()
+    assert next_generation.evaluator is generation.evaluator
+    assert next_generation.fitness(next_generation.fittest_individual()) >= next_generation.fitness(next_generation.population[1])
+    played = generation.evaluator.games_played
+    next_generation.fitness(expert)
+    assert generation.evaluator.games_played == played
+
+def test_strategies_pickle_by_name():
+    custom = Strategy.register(Strategy('Custom', lambda nim: Move(nim.rows.index(max(nim.rows)), 1)))
+    try:
+        for strategy in Strategy.all() + [custom]:
+            assert loads(dumps(strategy)) == strategy
+        assert custom in Strategy.registered()
+    finally:
+        registry.pop(custom.name)
+    assert loads(dumps(expert)) == expert
+
+def test_parallel_evaluation_is_reproducible():
+    candidates = [random, gabriele, expert, State()]
+    serial = FitnessEvaluator(initial_games = 20, batch_games = 20, max_games = 100, seed = 7)
+    serial.rank(candidates, 2)
+    with ProcessPoolExecutor(2) as pool:
+        parallel = FitnessEvaluator(initial_games = 20, batch_games = 20, max_games = 100, seed = 7, pool = pool)
+        parallel.rank(candidates, 2)
+    assert parallel.scores == serial.scores
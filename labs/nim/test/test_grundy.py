@@ -0,0 +1,65 @@
+from src import grundy
+from src.grundy import GrundyTables, tables
+from src.strategy import Strategy, winning_moves
+from src.simulator import play_games, gabriele_moves, expert_system_moves, optimal_moves
+from src.strategy import gabriele, expert_system
+from src.game import Game
+from src.nim import Nim
+from src.move import Move
+from itertools import product
+from .brute_force import losing_position
+from numpy import array, arange, array_equal
+from numpy.random import default_rng
+
+boards = [rows for rows in product(range(6), range(8), range(10)) if sum(rows) > 0]
+
+def test_tables():
+    for k in range(1, 6):
+        computed = GrundyTables.compute(k, 40)
+        assert array_equal(computed.normal, arange(40) % (k + 1))
+        assert array_equal(computed.misere == 0, arange(40) % (k + 1) == 1) # a single row loses when n = 1 mod k + 1
+        for n, value in product(range(40), range(k + 1)):
+            taken = computed.moves[n, value]
+            assert taken == 0 or (taken <= min(n, k) and computed.normal[n - taken] == value)
+
+def test_tame_misere_rule():
+    for k in range(1, 5):
+        for rows in boards:
+            assert tables(k, 10).losing(rows) == losing_position(rows, k)
+
+def test_limited_winning_moves():
+    for k in range(1, 5):
+        for rows in boards:
+            expected = {Move(r, o) for r, c in enumerate(rows) for o in range(1, min(c, k) + 1)
+                        if losing_position(rows[:r] + (c - o,) + rows[r + 1:], k)}
+            assert set(winning_moves(Nim.from_rows(list(rows), k))) == expected
+
+def test_tables_are_persisted(monkeypatch): # the cache directory is a temporary one, see conftest
+    computed = tables(3, 100)
+    assert [path.name for path in grundy.cache_directory.iterdir()] == ['k3.npz'] and computed.size >= 100
+    assert tables(3, 50) is computed
+    monkeypatch.setattr(grundy, '_tables', dict())
+    loaded = tables(3, 100)
+    assert array_equal(loaded.moves, computed.moves) and array_equal(loaded.misere, computed.misere)
+
+def test_limited_batch_moves():
+    for k in range(1, 5):
+        for move_maker, move in ((gabriele_moves, gabriele), (expert_system_moves, expert_system)):
+            row, quantity = move_maker(array(boards), default_rng(0), k)
+            assert [Move(int(r), int(q)) for r, q in zip(row, quantity)] == [move(Nim.from_rows(list(rows), k)) for rows in boards]
+        row, quantity = optimal_moves(array(boards), default_rng(0), k)
+        for rows, move in zip(boards, (Move(int(r), int(q)) for r, q in zip(row, quantity))):
+            winning = winning_moves(Nim.from_rows(list(rows), k))
+            assert move in winning or (not winning and 0 < move.quantity <= min(rows[move.row], k))
+
+def test_limited_games():
+    strategies = Strategy.all()
+    for k, (player, opponent) in product((1, 2, 3), product(strategies, repeat = 2)):
+        Game(5, player, opponent, True, k).play()
+    optimal = Strategy.optimal()
+    for k, opponent in product((2, 3, 5), strategies):
+        if not tables(k, 10).losing(Nim(5).rows):
+            assert Game(5, optimal, opponent, True, k).player_wins()
+    games = 200
+    wins = play_games(5, strategies, [2] * games, [0] * games, [True] * games, default_rng(0), k = 3)
+    assert wins.all() == (not tables(3, 10).losing(Nim(5).rows))
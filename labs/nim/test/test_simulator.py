@@ -0,0 +1,46 @@
+from src.simulator import play_games, gabriele_moves, expert_system_moves, optimal_moves, random_moves
+from src.strategy import Strategy, winning_moves, gabriele, expert_system
+from src.game import Game
+from src.nim import Nim
+from src.move import Move
+from itertools import product
+from numpy import array
+from numpy.random import default_rng
+from math import sqrt
+
+boards = [rows for rows in product(range(4), range(4), range(6), range(3)) if sum(rows) > 0]
+
+def batch_moves(move_maker, rows, seed = 0) -> list[Move]:
+    row, quantity = move_maker(array(rows), default_rng(seed))
+    return [Move(int(r), int(q)) for r, q in zip(row, quantity)]
+
+def test_deterministic_moves():
+    for move_maker, move in ((gabriele_moves, gabriele), (expert_system_moves, expert_system)):
+        expected = [move(Nim.from_rows(list(rows))) for rows in boards]
+        assert batch_moves(move_maker, boards) == expected
+
+def test_optimal_moves_are_winning():
+    for rows, move in zip(boards, batch_moves(optimal_moves, boards)):
+        winning = winning_moves(Nim.from_rows(list(rows)))
+        assert move in winning or not winning
+        assert 0 < move.quantity <= rows[move.row]
+
+def test_random_moves_are_uniform():
+    rows = [[0, 3, 1, 2]] * 60000
+    moves = batch_moves(random_moves, rows)
+    assert all(0 < move.quantity <= rows[0][move.row] for move in moves)
+    for row, quantity in ((1, 1), (1, 3), (2, 1), (3, 2)):
+        expected = 1 / 3 / rows[0][row]
+        assert abs(moves.count(Move(row, quantity)) / len(moves) - expected) < 5 * sqrt(expected / len(moves))
+
+def test_same_results_as_game():
+    strategies = Strategy.all()
+    games = 400
+    rng = default_rng(42)
+    for (player, first), (opponent, second) in product(enumerate(strategies), repeat = 2):
+        play_first = [True, False] * (games // 2)
+        wins = play_games(4, strategies, [player] * games, [opponent] * games, play_first, rng)
+        expected = [Game(4, first, second, starts).player_wins() for starts in play_first]
+        batch_rate, game_rate = wins.mean(), sum(expected) / games
+        error = sqrt(max(game_rate * (1 - game_rate), 1 / games) / games)
+        assert abs(batch_rate - game_rate) < 5 * sqrt(2) * error, (first, second)
@@ -1,8 +1,9 @@
-from src.strategy import Strategy
+from src.strategy import Strategy, winning_moves
 from src.game import Game
 from src.nim import Nim
 from src.nim import Move
 from itertools import product
+from .brute_force import losing_position
 
 def test_gabriele_vs_expert_system():
     player = Strategy.expert_system()
@@ -53,4 +54,18 @@ def test_expert_system_limit_case():
 
     for nim, best_move in best_moves:
         es_move = expert_system.make_move(nim)
-        assert es_move == best_move
\ No newline at end of file
+        assert es_move == best_move
+
+def test_optimal_winning_moves():
+    for rows in product(range(4), range(4), range(6)):
+        if sum(rows) == 0:
+            continue
+        expected = {Move(r, o) for r, c in enumerate(rows) for o in range(1, c + 1)
+                    if losing_position(rows[:r] + (c - o,) + rows[r + 1:])}
+        assert set(winning_moves(Nim.from_rows(list(rows)))) == expected
+
+def test_optimal_wins_from_winning_position():
+    num_rows = 101 # nim sum of the initial rows is not 0
+    assert Nim(num_rows).nim_sum() != 0
+    for opponent in (Strategy.random(), Strategy.gabriele(), Strategy.expert_system()):
+        assert Game(num_rows, Strategy.optimal(), opponent, play_first = True).player_wins()
@@ -0,0 +1,37 @@
+from src.tournament import Tournament, play_pairing
+from src.strategy import Strategy
+from src.move import Move
+from concurrent.futures import ProcessPoolExecutor
+
+def test_pairing_counts_wins_and_moves():
+    result = play_pairing(Strategy.expert_system(), Strategy.gabriele(), 4, games = 20, seed = 0)
+    assert result.victories == 20 and result.forfeits == 0
+    assert result.player_moves > 0 and result.opponent_moves > 0
+    assert result.player_seconds > 0 and result.games_per_second > 0
+
+def test_illegal_moves_forfeit():
+    cheater = Strategy('Cheater', lambda nim: Move(0, 100))
+    result = play_pairing(cheater, Strategy.random(), 4, games = 10, seed = 0)
+    assert result.victories == 0 and result.forfeits == 10
+    for move in (Move(-1, 1), Move(4, 1), Move(0, 0), Move(3, 3)):
+        result = play_pairing(Strategy('Cheater', lambda nim: move), Strategy.random(), 4, k = 2, games = 10, seed = 0)
+        assert result.forfeits == 10
+    result = play_pairing(Strategy.gabriele(), Strategy.gabriele(), 4, k = 2, games = 10, seed = 0)
+    assert result.forfeits == 0
+
+def test_round_robin_is_reproducible():
+    tournament = Tournament(rows = (3, 4), ks = (None, 2), games = 20, seed = 3).play()
+    names = tournament.names
+    assert len(tournament.results) == len(names) ** 2 * 4
+    rates, lowers, uppers = tournament.win_rates()
+    assert ((lowers <= rates) & (rates <= uppers)).all()
+    optimal, gabriele = names.index('Optimal'), names.index('Gabriele')
+    assert rates[optimal, gabriele] > 0.5
+    assert set(tournament.speed()) == set(names)
+    assert len(tournament.selected(rows = 3, k = 2)) == len(names) ** 2
+    assert len(tournament.selected(k = None)) == len(names) ** 2 * 2
+    assert all(result.k is None for result in tournament.selected(rows = 4, k = None))
+    assert 'Expert system' in str(tournament)
+    with ProcessPoolExecutor(2) as pool:
+        parallel = Tournament(rows = (3, 4), ks = (None, 2), games = 20, seed = 3).play(pool)
+    assert [r.victories for r in parallel.results] == [r.victories for r in tournament.results]
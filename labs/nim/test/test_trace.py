@@ -0,0 +1,50 @@
+from src.trace import Trace, TraceRecorder
+from src.strategy import Strategy
+from src.simulator import play_games
+from src.game import Game
+from src.nim import Nim
+from numpy.random import default_rng
+from functools import reduce
+from operator import xor
+from pytest import raises
+
+def test_game_recording_and_replay(tmp_path):
+    with TraceRecorder(tmp_path, capacity = 8) as recorder:
+        wins = [Game(4, Strategy.optimal(), Strategy.random(), first, k).player_wins(recorder)
+                for first, k in ((True, None), (False, 2), (True, 3))]
+    assert recorder.chunks_written > 1
+    trace = Trace.load(tmp_path)
+    assert list(trace.games['id']) == [0, 1, 2] and list(trace.games['k']) == [-1, 2, 3]
+    for game, won in enumerate(wins):
+        columns = trace.game(game)
+        positions = trace.replay(game)
+        assert positions[0] == Nim(4).rows and sum(positions[-1]) == 0
+        assert list(columns['turn']) == list(range(len(positions) - 1))
+        assert list(columns['nim_sum']) == [reduce(xor, position) for position in positions[:-1]]
+        assert columns['player'][-1] != won # who takes the last object loses
+        assert columns['player'][0] == (game != 1)
+
+def test_batch_recording_in_memory():
+    strategies = Strategy.all()
+    recorder = TraceRecorder(capacity = 50)
+    games = 100
+    rng = default_rng(0)
+    wins = play_games(5, strategies, rng.integers(0, 4, games), rng.integers(0, 4, games), [True] * games, rng, 3, recorder)
+    trace = recorder.trace()
+    assert len(trace.games['id']) == games and recorder.chunks_written > 1
+    for game in range(games):
+        columns = trace.game(game)
+        positions = trace.replay(game)
+        assert sum(positions[-1]) == 0 and (columns['quantity'] <= 3).all()
+        assert columns['player'][-1] != wins[game]
+
+def test_recordings_are_not_mixed(tmp_path):
+    with TraceRecorder(tmp_path / 'first') as recorder:
+        Game(3, Strategy.optimal(), Strategy.random(), True).player_wins(recorder)
+    with raises(ValueError):
+        TraceRecorder(tmp_path / 'first')
+    with TraceRecorder(tmp_path / 'second') as recorder:
+        Game(3, Strategy.optimal(), Strategy.random(), True).player_wins(recorder)
+    (tmp_path / 'second' / 'trace_00000.npz').rename(tmp_path / 'first' / 'trace_00001.npz')
+    with raises(ValueError):
+        Trace.load(tmp_path / 'first')
@@ -0,0 +1,97 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from itertools import combinations
+from time import perf_counter
+from numpy import bool_, float32, int64, argmax, array, flatnonzero, ones
+from numpy.typing import NDArray
+from instance import Instance
+from state import State
+from heuristics import Heuristic, MAX_MARGINAL, DISJOINT_PACKING
+
+@dataclass(frozen=True)
+class GreedyResult():
+    taken: tuple[int, ...]
+    greedy_cost: int # before local search
+    lower_bound: int
+    seconds: float
+
+    @property
+    def cost(self) -> int:
+        return len(self.taken)
+
+    def __str__(self) -> str:
+        return (f'cost {self.cost} (greedy {self.greedy_cost}), lower bound {self.lower_bound}, '
+                f'{self.seconds * 1e3:.1f} ms')
+
+def greedy(instance: Instance) -> list[int]:
+    """Repeatedly takes the set covering most uncovered elements: all the gains come from one matrix-vector product"""
+
+    uncovered = ones(instance.problem_size, dtype = float32)
+    taken = []
+    while uncovered.any():
+        gains = instance.matrix @ uncovered
+        best = int(argmax(gains))
+        if gains[best] == 0:
+            raise ValueError('The sets do not cover all the elements')
+        taken.append(best)
+        uncovered[instance.sets[best]] = 0
+    return taken
+
+def coverage_counts(instance: Instance, taken: list[int]) -> NDArray[int64]:
+    """How many taken sets cover each element"""
+    return instance.sets[taken].sum(axis = 0, dtype = int64)
+
+def remove_redundant(instance: Instance, taken: list[int]) -> list[int]:
+    """Drops sets whose elements are all covered by other taken sets, those covering fewer elements first"""
+
+    taken = sorted(taken, key = lambda index: instance.sets[index].sum())
+    counts = coverage_counts(instance, taken)
+    while True:
+        uniquely_covered = (counts == 1).astype(float32)
+        redundant = flatnonzero(instance.matrix[taken] @ uniquely_covered == 0)
+        if not len(redundant):
+            return taken
+        removed = taken.pop(int(redundant[0]))
+        counts -= instance.sets[removed]
+
+def swap_two_for_one(instance: Instance, taken: list[int]) -> list[int] | None:
+    """Replaces a pair of taken sets with one set covering all the elements only that pair covers, None if
+    there is no such swap. Every pair is checked against every set with one matrix product"""
+
+    if len(taken) < 2:
+        return None
+    counts = coverage_counts(instance, taken)
+    pairs = list(combinations(range(len(taken)), 2))
+    first, second = array(pairs).T
+    taken_sets = instance.sets[taken]
+    left_uncovered: NDArray[bool_] = counts - taken_sets[first] - taken_sets[second] == 0 # pairs x elements
+    needed = left_uncovered.sum(axis = 1)
+    covering = instance.matrix @ left_uncovered.T.astype(float32) == needed # sets x pairs
+    covering[taken] = False
+    replacements = flatnonzero(covering.any(axis = 0))
+    if not len(replacements):
+        return None
+    pair = int(replacements[0])
+    replacement = int(argmax(covering[:, pair]))
+    return [index for i, index in enumerate(taken) if i not in pairs[pair]] + [replacement]
+
+def local_search(instance: Instance, taken: list[int]) -> list[int]:
+    """Redundancy elimination and 2-for-1 swaps until neither improves the cover"""
+
+    taken = remove_redundant(instance, taken)
+    while (swapped := swap_two_for_one(instance, taken)) is not None:
+        taken = remove_redundant(instance, swapped)
+    return taken
+
+def lower_bound(instance: Instance, heuristics: tuple[Heuristic, ...] = (MAX_MARGINAL, DISJOINT_PACKING)) -> int:
+    """Best bound of the admissible heuristics on the empty cover"""
+    return max(int(heuristic(State.initial(instance, heuristic))) for heuristic in heuristics)
+
+def solve(instance: Instance, heuristics: tuple[Heuristic, ...] = (MAX_MARGINAL, DISJOINT_PACKING)) -> GreedyResult:
+    start = perf_counter()
+    taken = greedy(instance)
+    greedy_cost = len(taken)
+    taken = local_search(instance, taken)
+    if not instance.sets[taken].any(axis = 0).all():
+        raise ValueError(f'Local search left elements uncovered, sets {sorted(taken)} are not a cover')
+    return GreedyResult(tuple(sorted(taken)), greedy_cost, lower_bound(instance, heuristics), perf_counter() - start)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, TYPE_CHECKING
+from math import ceil, inf
+from numpy import argsort, ones, zeros_like
+from instance import Words, pack, popcount
+from scipy.optimize import linprog
+
+if TYPE_CHECKING:
+    from state import State
+
+@dataclass(frozen=True)
+class Heuristic():
+    """Admissible estimate of the sets still needed to cover a state, inf when it cannot be covered anymore"""
+
+    name: str
+    estimate: Callable[[State], float]
+    marginals: bool = False # children get the largest marginal of their parent as a bound of theirs
+
+    def __call__(self, state: State) -> float:
+        return self.estimate(state)
+
+    def __str__(self) -> str:
+        return self.name
+
+def unit(state: State) -> float:
+    """One more set, unless already covered"""
+    return 0 if state.is_solution() else 1
+
+def max_marginal(state: State) -> float:
+    """Uncovered elements over the most elements a single set still adds, or over the bound of it inherited
+    from the parent"""
+
+    uncovered = state.instance.problem_size - state.covered
+    if uncovered == 0:
+        return 0
+    largest = state.largest_marginal if state.marginal_bound is None else state.marginal_bound
+    return ceil(uncovered / largest) if largest else inf
+
+def available_sets(state: State) -> Words:
+    """The sets that can still be added, packed like the rows of element_sets"""
+
+    available = ones(state.instance.num_sets, dtype = bool)
+    available[:state.first_available] = False
+    return pack(available)
+
+def disjoint_packing(state: State) -> float:
+    """Uncovered elements no two of which share a set need one set each. Rarest elements are packed first"""
+
+    instance, elements = state.instance, state.uncovered_elements
+    element_sets = instance.element_sets[elements] & available_sets(state)
+    frequency = popcount(element_sets)
+    if not frequency.all():
+        return inf
+    used_sets, packing = zeros_like(instance.universe_of_sets), 0
+    for element in argsort(frequency, kind = 'stable'):
+        if not (used_sets & element_sets[element]).any():
+            used_sets |= element_sets[element]
+            packing += 1
+    return packing
+
+def linear_relaxation(state: State) -> float:
+    """Optimum of the linear relaxation over the uncovered elements, rounded up"""
+
+    instance, elements = state.instance, state.uncovered_elements
+    if not len(elements):
+        return 0
+    coverage = instance.sets[state.first_available:, elements]
+    if not coverage.any(axis = 0).all():
+        return inf
+    coverage = coverage[coverage.any(axis = 1)].T.astype(float) # elements x sets covering some of them
+    result = linprog(ones(coverage.shape[1]), A_ub = -coverage, b_ub = -ones(len(elements)), bounds = (0, 1), method = 'highs')
+    return ceil(result.fun - 1e-7) if result.status == 0 else inf
+
+UNIT = Heuristic('unit', unit)
+MAX_MARGINAL = Heuristic('max marginal', max_marginal, marginals = True)
+DISJOINT_PACKING = Heuristic('disjoint packing', disjoint_packing)
+LINEAR_RELAXATION = Heuristic('linear relaxation', linear_relaxation)
+
+HEURISTICS = (UNIT, MAX_MARGINAL, DISJOINT_PACKING, LINEAR_RELAXATION)
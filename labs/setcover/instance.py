@@ -0,0 +1,98 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import cached_property, cache
+from pathlib import Path
+from os import replace
+from tempfile import NamedTemporaryFile
+from numpy import bool_, float32, uint8, uint64, int64, arange, array, ascontiguousarray, asarray, load, ones, packbits, pad, save
+from numpy.typing import NDArray
+from numpy.random import default_rng
+
+Words = NDArray[uint64]
+
+try:
+    from numpy import bitwise_count
+except ImportError: # numpy < 2.0
+    BITS = array([bin(byte).count('1') for byte in range(256)], dtype = uint8)
+    def bitwise_count(words: Words) -> NDArray[uint8]:
+        return BITS[words.view(uint8)]
+
+def popcount(words: Words) -> NDArray[int64]:
+    """Elements in every packed row"""
+    return bitwise_count(words).sum(axis = -1, dtype = int64)
+
+def pack(sets: NDArray[bool_]) -> Words:
+    """Rows of booleans as rows of 64-bit words"""
+    packed = packbits(sets, axis = -1)
+    padding = -packed.shape[-1] % 8
+    if padding:
+        packed = pad(packed, [(0, 0)] * (packed.ndim - 1) + [(0, padding)])
+    return ascontiguousarray(packed).view(uint64)
+
+@dataclass(frozen=True)
+class Instance():
+    """A set cover problem, shared read-only by all the states searching it: one row per set, one column per element"""
+
+    sets: NDArray[bool_]
+    packed: Words # the rows of sets bit-packed, P / 64 words each
+    universe: Words # the packed coverage of a solution
+    element_sets: Words # for every element the sets covering it, bit-packed, N / 64 words each
+    universe_of_sets: Words # all the sets, packed like the rows of element_sets
+    frequency: NDArray[int64] # number of sets covering every element
+
+    @staticmethod
+    def from_sets(sets: NDArray[bool_] | tuple[NDArray[bool_], ...], packed: Words | None = None) -> Instance:
+        """Read-only instance over sets, packed is computed unless given (e.g. memory-mapped from disk)"""
+
+        sets = asarray(sets, dtype = bool)
+        matrices = (sets, pack(sets) if packed is None else packed, pack(ones(sets.shape[1], dtype = bool)),
+                    pack(sets.T), pack(ones(sets.shape[0], dtype = bool)), sets.sum(axis = 0, dtype = int64))
+        for matrix in matrices:
+            matrix.flags.writeable = False
+        return Instance(*matrices)
+
+    @cached_property
+    def matrix(self) -> NDArray[float32]:
+        """The sets as float32, so that products with it go through BLAS"""
+        return self.sets.astype(float32)
+
+    @property
+    def num_sets(self) -> int:
+        return self.sets.shape[0]
+
+    @property
+    def problem_size(self) -> int:
+        return self.sets.shape[1]
+
+# where generated instances are cached, None to always generate them
+cache_directory: Path | None = Path(__file__).parent / 'instances'
+
+def generate(problem_size: int, num_sets: int, density: float, seed: int) -> NDArray[bool_]:
+    """Every set covers every element with probability density, then each element is added to a random set
+    so that the instance can be covered"""
+
+    rng = default_rng(seed)
+    sets = rng.random((num_sets, problem_size), dtype = float32) < density
+    sets[rng.integers(0, num_sets, problem_size), arange(problem_size)] = True
+    return sets
+
+def _save(path: Path, content: NDArray) -> None:
+    with NamedTemporaryFile(dir = path.parent, suffix = '.npy', delete = False) as file: # one per writer
+        save(file, content)
+    replace(file.name, path)
+
+@cache
+def instance(problem_size: int, num_sets: int, density: float, seed: int) -> Instance:
+    """The instance generated from these parameters, always the same. It is generated once and saved as a boolean
+    matrix and as its packed words, later both are memory-mapped read-only: loading is near instant and processes
+    loading the same instance share its pages"""
+
+    if cache_directory is None:
+        return Instance.from_sets(generate(problem_size, num_sets, density, seed))
+    directory = cache_directory / f'{problem_size}x{num_sets}_{density}_{seed}'
+    if not (directory / 'packed.npy').exists():
+        directory.mkdir(parents = True, exist_ok = True)
+        sets = generate(problem_size, num_sets, density, seed)
+        _save(directory / 'sets.npy', sets)
+        _save(directory / 'packed.npy', pack(sets)) # written last, its presence marks a complete instance
+    return Instance.from_sets(load(directory / 'sets.npy', mmap_mode = 'r'), load(directory / 'packed.npy', mmap_mode = 'r'))
@@ -1,20 +1,99 @@
+from __future__ import annotations
+from dataclasses import dataclass
 from state import State
+from instance import Instance, instance as make_instance
+from heuristics import Heuristic, HEURISTICS, MAX_MARGINAL
 from queue import PriorityQueue
-from problem_data import SETS
+from itertools import count
+from math import inf
+from time import perf_counter
+from sys import getsizeof, argv
+from greedy import solve
+import problem_data
 
-def main():
+@dataclass
+class SearchStats():
+    heuristic: str
+    expanded: int = 0
+    generated: int = 0
+    seconds: float = 0.
+    solution_cost: int | None = None
+    duplicates: int = 0 # states reached again, through another order of the same sets
+    closed_states: int = 0
+    closed_bytes: int = 0 # closed set table plus its keys
+    peak_frontier: int = 0
+
+    @property
+    def time_per_node(self) -> float:
+        """Seconds per expanded state, generating and estimating its children included"""
+        return self.seconds / self.expanded if self.expanded else 0.
+
+    def __str__(self) -> str:
+        return (f'{self.heuristic:<20} cost {self.solution_cost}, expanded {self.expanded}, generated {self.generated}, '
+                f'{self.seconds:.2f} s, {self.time_per_node * 1e6:.0f} µs/node, duplicates {self.duplicates}, '
+                f'peak frontier {self.peak_frontier}, closed {self.closed_states} ({self.closed_bytes / 1024:.0f} KiB)')
+
+def search(instance: Instance, heuristic: Heuristic = MAX_MARGINAL, max_expansions: int | None = None,
+           symmetry_breaking = True) -> tuple[State | None, SearchStats]:
+    '''A*, returns the first solution popped from the frontier (optimal, heuristics are admissible)
+    or None when the expansions limit is reached.
+    Expanded states are closed by their canonical key, so no subset of sets is expanded twice'''
+    stats, start = SearchStats(heuristic.name), perf_counter()
     frontier = PriorityQueue()
-    current_state = State.initial(SETS)
-    frontier.put((current_state.estimated_total_cost(), current_state))
+    tie_breaker = count() # states with the same estimate are expanded in insertion order, states are never compared
+    closed: set[tuple[int, ...]] = set()
+    current_state = State.initial(instance, heuristic, symmetry_breaking)
+    frontier.put((current_state.estimated_total_cost(), next(tie_breaker), current_state))
 
-    while not current_state.is_solution():
+    solution = None
+    while not frontier.empty() and (max_expansions is None or stats.expanded < max_expansions):
+        _, _, current_state = frontier.get()
+        if current_state.is_solution():
+            solution, stats.solution_cost = current_state, current_state.current_cost
+            break
+        if current_state.key in closed:
+            stats.duplicates += 1
+            continue
+        closed.add(current_state.key)
+        stats.closed_bytes += getsizeof(current_state.key)
+        stats.expanded += 1
         for covering_set in current_state.not_taken:
             adjacent_state : State = current_state.take_covering_set(covering_set)
-            frontier.put((adjacent_state.estimated_total_cost(), adjacent_state))
-        current_state = frontier.get()
+            stats.generated += 1
+            if adjacent_state.key in closed:
+                stats.duplicates += 1
+            elif adjacent_state.estimated_total_cost() < inf:
+                frontier.put((adjacent_state.estimated_total_cost(), next(tie_breaker), adjacent_state))
+        stats.peak_frontier = max(stats.peak_frontier, frontier.qsize())
+    stats.closed_states, stats.closed_bytes = len(closed), stats.closed_bytes + getsizeof(closed)
+    stats.seconds = perf_counter() - start
+    return solution, stats
+
+def compare_heuristics(problem_size = 40, num_sets = 20, density = 0.2, seed = 42):
+    '''Expanded nodes and time per node of every heuristic on the same small random instance'''
+    instance = make_instance(problem_size, num_sets, density, seed)
+    for heuristic in HEURISTICS:
+        _, stats = search(instance, heuristic)
+        print(stats)
+
+USAGE = 'usage: python main.py [greedy|astar]'
 
+def main(mode = 'greedy'):
+    '''greedy finds a good cover of the whole instance in milliseconds, astar an optimal one of small instances'''
+    if mode not in ('greedy', 'astar'):
+        raise SystemExit(USAGE)
+    instance = problem_data.instance()
+    if mode == 'greedy':
+        result = solve(instance)
+        print(f'Cover found, sets {result.taken}')
+        print(result)
+        return
+    solution, stats = search(instance)
     print('Solution found')
-    print(current_state)
+    print(solution)
+    print(stats)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    if len(argv) > 2:
+        raise SystemExit(USAGE)
+    main(*argv[1:])
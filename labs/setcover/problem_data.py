@@ -1,9 +1,16 @@
-from random import random
-from numpy import array
+from instance import Instance, instance as make_instance
 
 PROBLEM_SIZE = 500
 NUM_SETS = 10_000
-SETS = tuple(
-    array([random() < 0.3 for _ in range(PROBLEM_SIZE)])
-    for _ in range(NUM_SETS)
-)
+DENSITY = 0.3
+SEED = 42
+
+def instance() -> Instance:
+    """The instance of the lab, generated on first use and then loaded from disk"""
+    return make_instance(PROBLEM_SIZE, NUM_SETS, DENSITY, SEED)
+
+def __getattr__(name: str):
+    # SETS is created lazily, importing this module costs nothing
+    if name == 'SETS':
+        return instance().sets
+    raise AttributeError(f'module {__name__} has no attribute {name}')
@@ -1,45 +1,91 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from numpy import array, logical_or, bool_
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Iterator
+from numpy import uint8, uint64, int64, array_equal, flatnonzero, unpackbits, zeros_like
 from numpy.typing import NDArray
-from functools import reduce, cache
-from problem_data import PROBLEM_SIZE
+from instance import Instance, popcount
+from heuristics import Heuristic, UNIT
 
 @dataclass(frozen=True)
 class State():
-    current_cost: int
-    taken : tuple[NDArray[bool_] | None]
-    not_taken : tuple[NDArray[bool_]]
+    """Indices of the taken sets and their coverage, bit-packed: taking one more set is one OR over P / 64 words.
+    When the heuristic needs it, children carry the largest marginal (uncovered elements a set would add) of
+    their parent: marginals only shrink as sets are taken, so it bounds theirs in O(1). Exact marginals are
+    computed, with one popcount over the packed instance, only for the states that are expanded.
 
-    # read docs first but @cache is a good idea
-    def __current_coverage(self) -> NDArray[bool_]:
-        if not self.taken: return array([False for _ in range(PROBLEM_SIZE)])
-        return reduce(logical_or, self.taken)
+    With symmetry breaking only sets with an index above the last taken one can be added, so every subset
+    of sets is generated once, in increasing order, instead of once per permutation"""
+
+    instance: Instance = field(repr = False, compare = False)
+    taken: tuple[int, ...]
+    coverage: NDArray[uint64] = field(repr = False, compare = False)
+    heuristic: Heuristic = field(default = UNIT, repr = False, compare = False)
+    marginal_bound: int | None = field(default = None, repr = False, compare = False) # largest marginal of the parent
+    symmetry_breaking: bool = field(default = True, repr = False, compare = False)
+
+    @property
+    def current_cost(self) -> int:
+        return len(self.taken)
+
+    @property
+    def covered(self) -> int:
+        return int(popcount(self.coverage))
+
+    @cached_property
+    def uncovered_elements(self) -> NDArray[int64]:
+        covered = unpackbits(self.coverage.view(uint8))[:self.instance.problem_size]
+        return flatnonzero(covered == 0)
+
+    @property
+    def key(self) -> tuple[int, ...]:
+        """The same for all the states taking the same sets, whatever the order"""
+        return self.taken if self.symmetry_breaking else tuple(sorted(self.taken))
+
+    @property
+    def first_available(self) -> int:
+        """Sets with a lower index cannot be added anymore"""
+        return self.taken[-1] + 1 if self.symmetry_breaking and self.taken else 0
+
+    @property
+    def not_taken(self) -> Iterator[int]:
+        taken = set(self.taken)
+        return (index for index in range(self.first_available, self.instance.num_sets) if index not in taken)
 
     def is_solution(self) -> bool:
-        return all(self.__current_coverage())
+        return array_equal(self.coverage, self.instance.universe)
+
+    def take_covering_set(self, index: int) -> State:
+        coverage = self.coverage | self.instance.packed[index]
+        coverage.flags.writeable = False
+        marginal_bound = self.largest_marginal if self.heuristic.marginals else None
+        return State(self.instance, (*self.taken, index), coverage, self.heuristic, marginal_bound, self.symmetry_breaking)
+
+    @cached_property
+    def marginals(self) -> NDArray[int64]:
+        """Uncovered elements every set would add"""
+        return popcount(self.instance.packed & ~self.coverage)
 
-    def take_covering_set(self, covering_set: NDArray[bool_]) -> State:
-        new_state_taken : tuple[NDArray[bool_]] = (*self.taken, covering_set)
-        return State(
-            current_cost = self.current_cost + 1,
-            taken = (*self.taken, covering_set),
-            not_taken = tuple(x for x in self.not_taken if x != covering_set)
-        )
+    @cached_property
+    def largest_marginal(self) -> int:
+        """Most uncovered elements a set that can still be added would add"""
+        return int(self.marginals[self.first_available:].max(initial = 0))
 
-    def estimated_additional_cost(self) -> int:
-        return 1 # doesn't help to discard some branches but it's admissible
+    @cached_property
+    def _estimate(self) -> float:
+        return self.heuristic(self)
 
-    def estimated_total_cost(self) -> int:
+    def estimated_additional_cost(self) -> float:
+        return self._estimate
+
+    def estimated_total_cost(self) -> float:
         return self.current_cost + self.estimated_additional_cost()
 
     def fitness(self) -> tuple[int, int] :
-        current_coverage_size = sum(self.__current_coverage)
-        return (current_coverage_size, -self.current_cost)
+        return (self.covered, -self.current_cost)
 
     @staticmethod
-    def initial(available_sets: tuple[NDArray[bool_]]):
-        return State(current_cost = 0,
-                     taken = (),
-                     not_taken = available_sets)
-
+    def initial(instance: Instance, heuristic: Heuristic = UNIT, symmetry_breaking = True) -> State:
+        coverage = zeros_like(instance.universe)
+        coverage.flags.writeable = False
+        return State(instance, (), coverage, heuristic, None, symmetry_breaking)
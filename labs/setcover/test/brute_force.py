@@ -0,0 +1,11 @@
+from itertools import combinations
+from instance import Instance
+
+def optimal_cost(instance: Instance) -> int:
+    """Size of the smallest cover, trying every subset of sets by increasing size"""
+
+    for size in range(instance.num_sets + 1):
+        for taken in combinations(range(instance.num_sets), size):
+            if instance.sets[list(taken)].any(axis = 0).all():
+                return size
+    raise ValueError('The sets do not cover all the elements')
@@ -0,0 +1,5 @@
+from sys import path
+from pathlib import Path
+
+# the lab modules import each other by their bare names, as when running main.py from the lab directory
+path.insert(0, str(Path(__file__).parent.parent))
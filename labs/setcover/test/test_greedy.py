@@ -0,0 +1,36 @@
+from pytest import raises
+from instance import Instance, generate
+from .brute_force import optimal_cost
+from greedy import greedy, remove_redundant, local_search, lower_bound, solve
+from main import main
+
+def is_cover(instance: Instance, taken) -> bool:
+    return bool(instance.sets[list(taken)].any(axis = 0).all())
+
+def test_covers_and_bounds():
+    for seed in range(6):
+        instance = Instance.from_sets(generate(15, 10, .2, seed))
+        optimum = optimal_cost(instance)
+        taken = greedy(instance)
+        assert is_cover(instance, taken) and len(taken) >= optimum
+        assert lower_bound(instance) <= optimum
+        for improved in (remove_redundant(instance, taken), local_search(instance, taken)):
+            assert is_cover(instance, improved) and optimum <= len(improved) <= len(taken)
+        result = solve(instance)
+        assert is_cover(instance, result.taken) and result.lower_bound <= optimum <= result.cost <= result.greedy_cost
+
+def test_remove_redundant_keeps_needed_sets():
+    instance = Instance.from_sets(generate(30, 12, .2, 0))
+    taken = remove_redundant(instance, list(range(instance.num_sets)))
+    assert is_cover(instance, taken)
+    assert all(not is_cover(instance, [index for index in taken if index != removed]) for removed in taken)
+
+def test_uncoverable_instance():
+    sets = generate(10, 4, .2, 0)
+    sets[:, 0] = False
+    with raises(ValueError):
+        greedy(Instance.from_sets(sets))
+
+def test_unknown_mode():
+    with raises(SystemExit):
+        main('dijkstra')
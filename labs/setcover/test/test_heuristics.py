@@ -0,0 +1,73 @@
+from itertools import combinations
+from math import inf
+from numpy import ones
+from tracemalloc import start, stop, get_traced_memory
+from instance import Instance, generate
+from state import State
+from heuristics import HEURISTICS, MAX_MARGINAL
+from main import SearchStats
+
+def additional_cost(state: State) -> float:
+    """Brute force: fewest sets among the ones still available covering the rest of the instance"""
+
+    uncovered = state.uncovered_elements
+    available = list(state.not_taken)
+    for size in range(len(available) + 1):
+        for added in combinations(available, size):
+            if state.instance.sets[list(added)][:, uncovered].any(axis = 0).all():
+                return size
+    return inf
+
+def states(instance: Instance, heuristic, depth = 2) -> list[State]:
+    """The initial state and every state taking up to depth sets"""
+
+    reached, frontier = [], [State.initial(instance, heuristic)]
+    for _ in range(depth + 1):
+        reached += frontier
+        frontier = [state.take_covering_set(index) for state in frontier for index in state.not_taken]
+    return reached
+
+def test_heuristics_are_admissible():
+    for seed in range(5):
+        instance = Instance.from_sets(generate(12, 8, .25, seed))
+        for heuristic in HEURISTICS:
+            for state in states(instance, heuristic):
+                assert state.estimated_additional_cost() <= additional_cost(state), (heuristic.name, seed, state.taken)
+
+def test_heuristics_are_exact_on_solutions():
+    instance = Instance.from_sets(generate(12, 8, .25, 0))
+    for heuristic in HEURISTICS:
+        state = State.initial(instance, heuristic)
+        for index in range(instance.num_sets):
+            state = state.take_covering_set(index)
+        assert state.estimated_additional_cost() == 0
+
+def test_marginals_follow_coverage():
+    instance = Instance.from_sets(generate(40, 10, .2, 3))
+    for state in states(instance, MAX_MARGINAL):
+        covered = instance.sets[list(state.taken)].any(axis = 0)
+        assert state.marginals.tolist() == (instance.sets & ~covered).sum(axis = 1).tolist()
+
+def test_marginals_of_large_sets():
+    instance = Instance.from_sets(ones((2, 40_000), dtype = bool))
+    state = State.initial(instance, MAX_MARGINAL)
+    assert state.marginals.tolist() == [40_000, 40_000]
+    assert state.estimated_additional_cost() == 1
+
+def test_children_inherit_the_marginal_bound():
+    instance = Instance.from_sets(generate(200, 5000, .05, 0))
+    parent = State.initial(instance, MAX_MARGINAL)
+    parent.largest_marginal # computed once per expansion
+    start()
+    children = [parent.take_covering_set(index) for index in parent.not_taken]
+    estimates = [child.estimated_total_cost() for child in children]
+    peak = get_traced_memory()[1]
+    stop()
+    assert peak / len(children) < 2048 # a marginal per set would be 40 KB per child
+    assert all('marginals' not in child.__dict__ for child in children)
+    assert all(child.marginal_bound == parent.largest_marginal >= child.largest_marginal for child in children[:50])
+    assert min(estimates) >= 1
+
+def test_time_per_node_is_per_expansion():
+    assert SearchStats('unit', expanded = 4, generated = 40, seconds = 2.).time_per_node == .5
+    assert SearchStats('unit').time_per_node == 0.
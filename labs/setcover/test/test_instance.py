@@ -0,0 +1,31 @@
+import instance as instances
+from numpy import array_equal, memmap
+from instance import generate, pack
+
+def test_generate_is_deterministic_and_coverable():
+    sets = generate(200, 30, .01, 7)
+    assert array_equal(sets, generate(200, 30, .01, 7)) and not array_equal(sets, generate(200, 30, .01, 8))
+    assert sets.shape == (30, 200) and sets.any(axis = 0).all()
+
+def test_instance_round_trips_through_the_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(instances, 'cache_directory', tmp_path)
+    instances.instance.cache_clear()
+    try:
+        generated = instances.instance(100, 20, .1, 3)
+        assert instances.instance(100, 20, .1, 3) is generated
+        instances.instance.cache_clear()
+        loaded = instances.instance(100, 20, .1, 3)
+    finally:
+        instances.instance.cache_clear()
+    assert isinstance(loaded.sets.base, memmap) and isinstance(loaded.packed, memmap) # views of the files
+    assert array_equal(loaded.sets, generate(100, 20, .1, 3)) and array_equal(loaded.packed, pack(loaded.sets))
+    assert array_equal(loaded.frequency, generated.frequency) and (loaded.frequency > 0).all()
+    assert sorted(path.name for path in (tmp_path / '100x20_0.1_3').iterdir()) == ['packed.npy', 'sets.npy']
+
+def test_instance_without_cache(monkeypatch):
+    monkeypatch.setattr(instances, 'cache_directory', None)
+    instances.instance.cache_clear()
+    try:
+        assert array_equal(instances.instance(50, 10, .1, 0).sets, generate(50, 10, .1, 0))
+    finally:
+        instances.instance.cache_clear()
@@ -0,0 +1,26 @@
+from instance import Instance, generate
+from .brute_force import optimal_cost
+from heuristics import HEURISTICS, UNIT, MAX_MARGINAL
+from main import search
+
+def test_search_is_optimal():
+    for seed in range(4):
+        instance = Instance.from_sets(generate(15, 9, .2, seed))
+        optimum = optimal_cost(instance)
+        for heuristic in HEURISTICS:
+            for symmetry_breaking in (True, False):
+                solution, stats = search(instance, heuristic, symmetry_breaking = symmetry_breaking)
+                assert solution.is_solution() and stats.solution_cost == optimum == solution.current_cost
+                assert stats.closed_states == stats.expanded
+
+def test_closed_states_catch_permutations():
+    instance = Instance.from_sets(generate(15, 9, .2, 0))
+    _, ordered = search(instance, UNIT)
+    _, unordered = search(instance, UNIT, symmetry_breaking = False)
+    assert ordered.duplicates == 0 and unordered.duplicates > 0
+    assert unordered.solution_cost == ordered.solution_cost
+
+def test_expansion_limit():
+    instance = Instance.from_sets(generate(15, 9, .2, 0))
+    solution, stats = search(instance, MAX_MARGINAL, max_expansions = 1)
+    assert solution is None and stats.expanded == 1 and stats.solution_cost is None
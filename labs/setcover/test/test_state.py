@@ -0,0 +1,37 @@
+from numpy import bool_, uint8, unpackbits
+from numpy.typing import NDArray
+from numpy.random import default_rng
+from instance import Instance, generate
+from state import State
+
+def unpack(state: State) -> NDArray[bool_]:
+    return unpackbits(state.coverage.view(uint8))[:state.instance.problem_size].astype(bool)
+
+def test_packed_coverage_matches_boolean_or():
+    rng = default_rng(0)
+    instance = Instance.from_sets(generate(100, 30, .05, 0)) # more than one word per set
+    for _ in range(20):
+        taken = rng.choice(instance.num_sets, size = rng.integers(1, 10), replace = False)
+        state = State.initial(instance)
+        for index in sorted(taken.tolist()):
+            state = state.take_covering_set(index)
+        expected = instance.sets[taken].any(axis = 0)
+        assert (unpack(state) == expected).all()
+        assert state.covered == expected.sum()
+        assert state.uncovered_elements.tolist() == (~expected).nonzero()[0].tolist()
+
+def test_take_covering_set_leaves_parent_unchanged():
+    instance = Instance.from_sets(generate(20, 6, .3, 1))
+    initial = State.initial(instance)
+    child = initial.take_covering_set(2)
+    assert initial.covered == 0 and initial.taken == () and child.taken == (2,)
+    assert not child.coverage.flags.writeable
+    assert (unpack(child) == instance.sets[2]).all()
+
+def test_is_solution():
+    instance = Instance.from_sets(generate(70, 5, .2, 2))
+    state = State.initial(instance)
+    assert not state.is_solution()
+    for index in range(instance.num_sets):
+        state = state.take_covering_set(index)
+    assert state.is_solution() and state.covered == instance.problem_size and not len(state.uncovered_elements)